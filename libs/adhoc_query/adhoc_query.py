@@ -0,0 +1,64 @@
+import streamlit as st
+import sys
+sys.path.append('../')
+
+from libs.common.catalog import spec
+from libs.common.instrument import instrument_methods
+from libs.common.sql import DEFAULT_ROWS, MAX_ROWS, QueryError, engine
+
+EXAMPLE_QUERY = """SELECT "Admin1", "Year", SUM("Fatalities") AS fatalities
+FROM civilian_targeting
+GROUP BY ALL
+ORDER BY "Year", fatalities DESC"""
+
+
+@instrument_methods()
+class AdHocQueryPage:
+    def __init__(self):
+        self.engine = engine()
+
+    def display_tables(self):
+        """List every dataset table with its description and columns."""
+        with st.expander("Tables"):
+            for name, columns in self.engine.tables().items():
+                st.markdown(f"**{name}**: {spec(name).get('description', '')}")
+                st.dataframe(columns, use_container_width=True)
+            if self.engine.errors:
+                st.write("Datasets that failed to load:")
+                st.json(self.engine.errors)
+
+    def display_query(self):
+        """Run the query typed in and show the result."""
+        sql = st.text_area("SQL", value=EXAMPLE_QUERY, height=180)
+        limit = st.number_input("Row limit", min_value=1, max_value=MAX_ROWS, value=DEFAULT_ROWS, step=100)
+        if not sql.strip():
+            return
+        try:
+            result = self.engine.execute(sql, limit=int(limit))
+        except QueryError as e:
+            st.error(str(e))
+            return
+        except Exception as e:
+            st.error(f"{type(e).__name__}: {e}")
+            return
+
+        frame = result['frame']
+        source = "cached" if result['cached'] else f"{result['seconds'] * 1000:.0f} ms"
+        st.caption(f"{len(frame):,} row(s) ({source})")
+        if result['truncated']:
+            st.warning(f"Only the first {int(limit):,} rows are shown; raise the row limit or aggregate further.")
+        st.dataframe(frame, use_container_width=True)
+        st.download_button("Download CSV", frame.to_csv(index=False), file_name='query.csv')
+
+
+def aqmain():
+    st.header("Ad-hoc Query")
+    st.write("Query any dashboard dataset with SQL (DuckDB dialect). Each dataset is a table named as in the dataset "
+             "catalog; only SELECT statements are accepted.")
+    page = AdHocQueryPage()
+    page.display_tables()
+    page.display_query()
+
+
+if __name__ == "__main__":
+    aqmain()
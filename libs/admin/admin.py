@@ -0,0 +1,72 @@
+import hmac
+import os
+import streamlit as st
+import pandas as pd
+import sys
+sys.path.append('../')
+
+from libs.common import instrument
+from libs.common.dataset_store import STORE
+from libs.common.render_cache import RENDER_CACHE
+from libs.common.sql import engine
+from libs.common.warmup import readiness
+from libs.common.watcher import start_watcher
+
+# Secret that opens the page as ?admin=<token>; unset (the default) keeps the page off
+ADMIN_TOKEN = os.environ.get('DASHBOARD_ADMIN_TOKEN', '')
+
+
+def authorized(token):
+    """Whether ``token`` (the value of ``?admin=``) opens the admin page."""
+    if isinstance(token, (list, tuple)):  # experimental_get_query_params gives lists
+        token = token[0] if token else ''
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(str(token).encode(), ADMIN_TOKEN.encode())
+
+
+def display_timings():
+    """Per-call timing percentiles of every instrumented method and loader."""
+    st.subheader("Hot Path Timings")
+    recording = st.checkbox("Record timings", value=instrument.enabled())
+    instrument.set_enabled(recording)
+    summary = instrument.summary()
+    if summary.empty:
+        st.write("No calls recorded yet." if recording else "Recording is off.")
+    else:
+        st.dataframe(summary, use_container_width=True)
+    col1, col2, col3 = st.columns(3)
+    col1.download_button("Prometheus text", instrument.prometheus_text(), file_name='dashboard.prom')
+    col2.download_button("JSON lines", instrument.json_lines(), file_name='dashboard-calls.jsonl')
+    if col3.button("Reset timings"):
+        instrument.reset()
+
+
+def display_caches():
+    """Dataset store, render cache, warm-up and watcher state."""
+    st.subheader("Caches")
+    col1, col2, col3 = st.columns(3)
+    col1.write("Dataset store")
+    col1.json(STORE.stats())
+    col2.write("Render cache")
+    col2.json(RENDER_CACHE.stats())
+    col3.write("SQL engine")
+    col3.json(engine().stats())
+    payloads = RENDER_CACHE.payload_stats()
+    if payloads:
+        st.write("Plotly payloads (last render of each chart)")
+        st.dataframe(pd.DataFrame.from_dict(payloads, orient='index'), use_container_width=True)
+    st.write("Warm-up")
+    st.dataframe(pd.DataFrame.from_dict(readiness(), orient='index'), use_container_width=True)
+    watcher = start_watcher()
+    st.write(f"File watcher: {watcher.swaps} hot swap(s), {len(watcher.errors)} failing dataset(s)")
+    if watcher.errors:
+        st.json(watcher.errors)
+
+
+def admain():
+    st.title("Admin")
+    display_timings()
+    display_caches()
+
+
+if __name__ == "__main__":
+    admain()
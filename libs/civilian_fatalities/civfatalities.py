@@ -1,40 +1,46 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import sys
 sys.path.append('../')
 
+from libs.common.catalog import load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.aggregate_cube import cube_for
+from libs.common.bitmap_index import index_for
+from libs.common.figures import new_figure
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import plotly_chart, pyplot
+
 
 
-@st.cache_data
 def load_data():
-    """Load data from Excel and preprocess it."""
-    file_path = '/home/marktine/data Vis/Isreal_x_Hamas-BI-/libs/misic/data-points/spreadsheets/xslx/palestine_hrp_civilian_targeting_events_and_fatalities_by_month-year_as-of-29may2024.xlsx'
-    df = pd.read_excel(file_path, sheet_name='Data')
-    df['month_of_year'] = df['Month'].str[:3] + '-' + df['Year'].astype(str).str[-2:]
-    df['Fatalities'] = df['Fatalities'].astype(int)
-    return df
+    """Return the preprocessed data from the dataset catalog."""
+    return load('civilian_targeting')
+
+
+def derived_caches(df):
+    """Aggregate cube and filter index of a dataset version, built once and shared."""
+    return cube_for('civilian_targeting', df), index_for('civilian_targeting', df, ['Year', 'Admin1'])
 
 
+@instrument_methods()
 class PalestineDashboard:
     def __init__(self):
-        self.df = load_data()  # Load data using the standalone function
+        self.df = load_data()  # Shared read-only view from the dataset store
+        self.fingerprint = frame_fingerprint(self.df)
+        self.cube, self.index = derived_caches(self.df)  # Built once per dataset version
         self.filtered_df = None
+        self.filters = None
 
     def filter_data(self, selected_years, selected_regions):
         """Filter the dataframe based on selected years and regions."""
-        self.filtered_df = self.df[(self.df['Year'].isin(selected_years)) & (self.df['Admin1'].isin(selected_regions))]
+        self.filters = {'Year': selected_years, 'Admin1': selected_regions}
+        self.filtered_df = self.index.filter(self.df, self.filters)
 
     def calculate_yearly_metrics(self):
         """Calculate yearly metrics for the filtered data."""
-        return self.filtered_df.groupby('Year').agg(
-            total_events=('Events', 'sum'),
-            total_fatalities=('Fatalities', 'sum'),
-            avg_events=('Events', 'mean'),
-            avg_fatalities=('Fatalities', 'mean')
-        ).reset_index()
+        return self.cube.yearly_metrics(self.filters)
 
     def display_metrics(self, metrics):
         """Display key metrics in the sidebar."""
@@ -47,61 +53,121 @@ class PalestineDashboard:
     def plot_total_events_by_year(self, metrics):
         """Plot total events by year."""
         st.subheader("Total Events by Year")
-        fig = px.bar(metrics, x='Year', y='total_events', title='Total Events by Year')
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart('civilian_targeting.events_by_year', self.fingerprint,
+                     lambda: self.total_events_by_year_figure(metrics),
+                     params=self.filters, use_container_width=True)
+
+    def total_events_by_year_figure(self, metrics=None):
+        """Build the total events by year bar chart."""
+        metrics = self.calculate_yearly_metrics() if metrics is None else metrics
+        return px.bar(metrics, x='Year', y='total_events', title='Total Events by Year')
 
     def plot_total_fatalities_by_year(self, metrics):
         """Plot total fatalities by year."""
         st.subheader("Total Fatalities by Year")
-        fig = px.bar(metrics, x='Year', y='total_fatalities', title='Total Fatalities by Year')
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart('civilian_targeting.fatalities_by_year', self.fingerprint,
+                     lambda: self.total_fatalities_by_year_figure(metrics),
+                     params=self.filters, use_container_width=True)
+
+    def total_fatalities_by_year_figure(self, metrics=None):
+        """Build the total fatalities by year bar chart."""
+        metrics = self.calculate_yearly_metrics() if metrics is None else metrics
+        return px.bar(metrics, x='Year', y='total_fatalities', title='Total Fatalities by Year')
 
     def plot_trend_by_month_year(self):
         """Plot trend of total events by month-year."""
         st.subheader("Trend of Total Events by Month-Year")
-        events_by_month_year = self.filtered_df.groupby('month_of_year')['Events'].sum().reset_index()
-        events_by_month_year = events_by_month_year.sort_values('month_of_year')
-        fig = px.line(events_by_month_year, x='month_of_year', y='Events', title='Trend of Total Events by Month-Year')
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart('civilian_targeting.trend_by_month_year', self.fingerprint,
+                     self.trend_by_month_year_figure, params=self.filters, use_container_width=True)
+
+    def trend_by_month_year_figure(self):
+        """Build the month-year events trend line."""
+        events_by_month_year = self.cube.month_of_year_totals('Events', self.filters)
+        return px.line(events_by_month_year, x='month_of_year', y='Events', title='Trend of Total Events by Month-Year')
 
     def plot_fatalities_by_region(self):
         """Plot total fatalities by region."""
         st.subheader("Total Fatalities by Region")
-        fatalities_by_region = self.filtered_df.groupby('Admin2')['Fatalities'].sum().reset_index()
+        plotly_chart('civilian_targeting.fatalities_by_region', self.fingerprint,
+                     self.fatalities_by_region_figure, params=self.filters, use_container_width=True)
+
+    def fatalities_by_region_figure(self):
+        """Build the fatalities by Admin2 bar chart."""
+        fatalities_by_region = self.cube.rollup(['Admin2'], self.filters)['Fatalities'].reset_index()
         fig = px.bar(fatalities_by_region, x='Admin2', y='Fatalities', title='Total Fatalities by Region (Admin2)')
         fig.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
 
     def plot_bubble_chart(self):
         """Plot a bubble chart of fatalities by region and year."""
         st.subheader("Bubble Chart of Fatalities by Region and Year")
-        fig = px.scatter(self.filtered_df, x='Admin2', y='Year', size='Fatalities', color='Admin1',
+        plotly_chart('civilian_targeting.bubble', self.fingerprint,
+                     self.bubble_chart_figure, params=self.filters, use_container_width=True)
+
+    def bubble_chart_figure(self):
+        """Build the fatalities bubble chart: one bubble per region and year, summed in the cube."""
+        bubbles = self.cube.rollup(['Admin1', 'Admin2', 'Year'], self.filters)['Fatalities'].reset_index()
+        fig = px.scatter(bubbles, x='Admin2', y='Year', size='Fatalities', color='Admin1',
                          title='Bubble Chart of Fatalities by Region (Admin2) and Year')
         fig.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
 
     def plot_correlation_heatmap(self):
         """Plot a correlation heatmap between events and fatalities."""
         st.subheader("Correlation Heatmap: Events and Fatalities")
+        pyplot('civilian_targeting.correlation', self.fingerprint,
+               self.correlation_heatmap_figure, params=self.filters)
+
+    def correlation_heatmap_figure(self):
+        """Build the events/fatalities correlation heatmap."""
         correlation_data = self.filtered_df[['Events', 'Fatalities']]
         correlation_matrix = correlation_data.corr()
-        fig, ax = plt.subplots()
+        fig, ax = new_figure()
         sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", vmin=-1, vmax=1, ax=ax)
-        st.pyplot(fig)
+        return fig
 
     def plot_total_events_heatmap(self):
         """Plot total events heatmap by region and year."""
         st.subheader("Total Events Heatmap by Region and Year")
-        events_pivot = self.filtered_df.pivot_table(values='Events', index='Admin1', columns='Year', aggfunc='sum', fill_value=0)
-        fig = px.imshow(events_pivot, title='Total Events Heatmap by Region (Admin1) and Year')
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart('civilian_targeting.events_heatmap', self.fingerprint,
+                     self.total_events_heatmap_figure, params=self.filters, use_container_width=True)
+
+    def total_events_heatmap_figure(self):
+        """Build the Admin1 x Year events heatmap."""
+        events_pivot = self.cube.pivot('Events', index='Admin1', columns='Year', filters=self.filters)
+        return px.imshow(events_pivot, title='Total Events Heatmap by Region (Admin1) and Year')
 
     def plot_total_fatalities_heatmap(self):
         """Plot total fatalities heatmap by region and year."""
         st.subheader("Total Fatalities Heatmap by Region and Year")
-        fatalities_pivot = self.filtered_df.pivot_table(values='Fatalities', index='Admin2', columns='Year', aggfunc='sum', fill_value=0)
-        fig = px.imshow(fatalities_pivot, title='Total Fatalities Heatmap by Region (Admin2) and Year')
-        st.plotly_chart(fig, use_container_width=True)
+        plotly_chart('civilian_targeting.fatalities_heatmap', self.fingerprint,
+                     self.total_fatalities_heatmap_figure, params=self.filters, use_container_width=True)
+
+    def total_fatalities_heatmap_figure(self):
+        """Build the Admin2 x Year fatalities heatmap."""
+        fatalities_pivot = self.cube.pivot('Fatalities', index='Admin2', columns='Year', filters=self.filters)
+        return px.imshow(fatalities_pivot, title='Total Fatalities Heatmap by Region (Admin2) and Year')
+
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('civilian_targeting.events_by_year', 'Total Events by Year', 'total_events_by_year_figure'),
+    ('civilian_targeting.fatalities_by_year', 'Total Fatalities by Year', 'total_fatalities_by_year_figure'),
+    ('civilian_targeting.trend_by_month_year', 'Trend of Total Events by Month-Year', 'trend_by_month_year_figure'),
+    ('civilian_targeting.fatalities_by_region', 'Total Fatalities by Region', 'fatalities_by_region_figure'),
+    ('civilian_targeting.bubble', 'Bubble Chart of Fatalities by Region and Year', 'bubble_chart_figure'),
+    ('civilian_targeting.correlation', 'Correlation Heatmap: Events and Fatalities', 'correlation_heatmap_figure'),
+    ('civilian_targeting.events_heatmap', 'Total Events Heatmap by Region and Year', 'total_events_heatmap_figure'),
+    ('civilian_targeting.fatalities_heatmap', 'Total Fatalities Heatmap by Region and Year', 'total_fatalities_heatmap_figure'),
+]
+
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit, with every year and region selected."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    dashboard = PalestineDashboard()
+    dashboard.filter_data(sorted(dashboard.df['Year'].unique()), sorted(dashboard.df['Admin1'].unique()))
+    return getattr(dashboard, builder)()
 
 
 def cfmain():
@@ -1,125 +1,159 @@
 # Import necessary libraries
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import numpy as np
 import sys
 sys.path.append('../')
 
+from libs.common.catalog import load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.downsample import plot_downsampled, pyramid_for
+from libs.common.figures import new_figure
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import pyplot
+from libs.common.sql import query
+
+# Daily series drawn by DataVisualizer
+DAILY_SERIES = ['killed total', 'injured', 'displaced', 'damaged housing units']
+
+
+def derived_caches(df):
+    """Zoom levels of every daily series of a dataset version, built once and shared."""
+    return [pyramid_for(df, 'date', column) for column in DAILY_SERIES]
+
+
 class DataAnalyzer:
-    def __init__(self, file_path):
-        self.file_path = file_path
-        self.data = self.load_data()
-        self.clean_data = self.clean_data()
+    def __init__(self, dataset='escalation_impact'):
+        self.dataset = dataset
+        self.clean_data = self.load_data()
 
     def load_data(self):
-        """Load dataset from the given file path."""
+        """Load the cleaned dataset (empty columns dropped, dates parsed) via the dataset catalog."""
         try:
-            return pd.read_excel(self.file_path)
+            return load(self.dataset)
         except Exception as e:
             print(f"Error reading Excel file: {e}")
             return None
 
-    def clean_data(self):
-        """Clean the dataset by removing empty columns and converting dates."""
-        if self.data is None:
-            return None
-        clean_data = self.data.dropna(axis=1, how='all')
-        clean_data['date'] = pd.to_datetime(clean_data['date'])
-        return clean_data
-
-
     def get_summary_statistics(self):
         """Compute summary statistics."""
-        return {
-            'killed_female_total': self.clean_data['killed female'].sum(),
-            'killed_male_total': self.clean_data['killed male'].sum(),
-            'killed_undefined_total': self.clean_data['killed undefined'].sum(),
-            'total_injuries': self.clean_data['injured'].sum(),
-            'total_displaced': self.clean_data['displaced'].sum(),
-            'total_killed': self.clean_data['killed total'].sum(),
-        }
-
+        totals = query(f"""
+            SELECT CAST(COALESCE(SUM("killed female"), 0) AS BIGINT) AS killed_female_total,
+                   CAST(COALESCE(SUM("killed male"), 0) AS BIGINT) AS killed_male_total,
+                   CAST(COALESCE(SUM("killed undefined"), 0) AS BIGINT) AS killed_undefined_total,
+                   CAST(COALESCE(SUM("injured"), 0) AS BIGINT) AS total_injuries,
+                   CAST(COALESCE(SUM("displaced"), 0) AS BIGINT) AS total_displaced,
+                   CAST(COALESCE(SUM("killed total"), 0) AS BIGINT) AS total_killed
+            FROM {self.dataset}
+        """)
+        return {key: int(value) for key, value in totals.iloc[0].items()}
+
+@instrument_methods()
 class DataVisualizer:
+    """Daily series are reduced to the pixel width of their axes (LTTB) before plotting."""
+
     def __init__(self, clean_data):
         self.clean_data = clean_data
 
     def plot_killed_and_injured(self):
         """Plot total killed and injured over time."""
-        fig, ax1 = plt.subplots(figsize=(10, 6))
+        fig, ax1 = new_figure(figsize=(10, 6))
 
         ax1.set_xlabel('Date')
         ax1.set_ylabel('Killed', color='red')
-        ax1.plot(self.clean_data['date'], self.clean_data['killed total'], color='red', label='Total Killed')
+        plot_downsampled(ax1, self.clean_data, 'date', 'killed total', color='red', label='Total Killed')
         ax1.tick_params(axis='y', labelcolor='red')
 
         ax2 = ax1.twinx()
         ax2.set_ylabel('Injured', color='blue')
-        ax2.plot(self.clean_data['date'], self.clean_data['injured'], color='blue', label='Injured')
+        plot_downsampled(ax2, self.clean_data, 'date', 'injured', color='blue', label='Injured')
         ax2.tick_params(axis='y', labelcolor='blue')
 
-        plt.title('Comparison of Killed and Injured Over Time')
+        ax1.set_title('Comparison of Killed and Injured Over Time')
         return fig
 
     def plot_killed_by_gender(self, gender_killed_totals):
         """Plot total killed by gender."""
-        fig, ax = plt.subplots(figsize=(10, 7))
+        fig, ax = new_figure(figsize=(10, 7))
         ax.bar(gender_killed_totals.keys(), gender_killed_totals.values(), color=['orange', 'blue', 'green'])
 
-        plt.title('Total Killed by Gender')
-        plt.xlabel('Gender')
-        plt.ylabel('Number of Killed')
+        ax.set_title('Total Killed by Gender')
+        ax.set_xlabel('Gender')
+        ax.set_ylabel('Number of Killed')
 
-        plt.yticks(np.arange(0, max(gender_killed_totals.values()) + 100000, 100000))
-        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, pos: f'{int(x / 100000)}L'))
+        # whole lakhs, at most about ten ticks however large the totals get
+        step = 100000 * max(1, int(np.ceil(max(gender_killed_totals.values()) / 100000 / 10)))
+        ax.set_yticks(np.arange(0, max(gender_killed_totals.values()) + step, step))
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, pos: f'{int(x / 100000)}L'))
         return fig
 
     def plot_injured_and_displaced(self):
         """Plot injured and displaced over time."""
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(self.clean_data['date'], self.clean_data['injured'], label='Injured', color='blue')
-        ax.plot(self.clean_data['date'], self.clean_data['displaced'], label='Displaced', color='green')
-
-        plt.title('Injured and Displaced Over Time')
-        plt.xlabel('Date')
-        plt.ylabel('Count')
-        plt.legend()
-        plt.grid(True)
+        fig, ax = new_figure(figsize=(10, 6))
+        plot_downsampled(ax, self.clean_data, 'date', 'injured', label='Injured', color='blue')
+        plot_downsampled(ax, self.clean_data, 'date', 'displaced', label='Displaced', color='green')
+
+        ax.set_title('Injured and Displaced Over Time')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Count')
+        ax.legend()
+        ax.grid(True)
         return fig
 
     def plot_damaged_housing_units(self):
         """Plot damaged housing units over time."""
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(self.clean_data['date'], self.clean_data['damaged housing units'], label='Damaged Housing Units', color='purple')
-
-        plt.title('Damaged Housing Units Over Time')
-        plt.xlabel('Date')
-        plt.ylabel('Number of Units')
-        plt.legend()
-        plt.grid(True)
+        fig, ax = new_figure(figsize=(12, 6))
+        plot_downsampled(ax, self.clean_data, 'date', 'damaged housing units', label='Damaged Housing Units', color='purple')
+
+        ax.set_title('Damaged Housing Units Over Time')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Number of Units')
+        ax.legend()
+        ax.grid(True)
         return fig
 
     def plot_total_displaced(self):
         """Plot total number of displaced people over time."""
-        fig, ax = plt.subplots(figsize=(12, 7))
-        ax.plot(self.clean_data['date'], self.clean_data['displaced'], label='Total Displaced', color='purple', marker='o', alpha=0.7)
+        fig, ax = new_figure(figsize=(12, 7))
+        plot_downsampled(ax, self.clean_data, 'date', 'displaced', label='Total Displaced', color='purple', marker='o', alpha=0.7)
 
-        plt.title('Total Number of Displaced People Over Time')
-        plt.xlabel('Date')
-        plt.ylabel('Total Number of Displaced People')
+        ax.set_title('Total Number of Displaced People Over Time')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Total Number of Displaced People')
         ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f'{int(x):,}'))
 
-        plt.grid(True)
-        plt.legend()
+        ax.grid(True)
+        ax.legend()
         return fig
 
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('escalation.killed_and_injured', 'Total Killed and Injured Over Time', 'plot_killed_and_injured'),
+    ('escalation.killed_by_gender', 'Total Killed by Gender', 'plot_killed_by_gender'),
+    ('escalation.injured_and_displaced', 'Injured and Displaced Over Time', 'plot_injured_and_displaced'),
+    ('escalation.damaged_housing_units', 'Damaged Housing Units Over Time', 'plot_damaged_housing_units'),
+    ('escalation.total_displaced', 'Total Number of Displaced People Over Time', 'plot_total_displaced'),
+]
+
+def gender_killed_totals(summary_stats):
+    return {
+        'Killed Female': summary_stats['killed_female_total'],
+        'Killed Male': summary_stats['killed_male_total'],
+        'Killed Undefined': summary_stats['killed_undefined_total']
+    }
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    data_analyzer = DataAnalyzer()
+    visualizer = DataVisualizer(data_analyzer.clean_data)
+    if chart_id == 'escalation.killed_by_gender':
+        return visualizer.plot_killed_by_gender(gender_killed_totals(data_analyzer.get_summary_statistics()))
+    return getattr(visualizer, builder)()
+
 def main():
-    # File path for the dataset
-    file_path = r'/home/marktine/data Vis/Isreal_x_Hamas-BI-/libs/misic/data-points/spreadsheets/xslx/palestine_hrp_civilian_targeting_events_and_fatalities_by_month-year_as-of-29may2024.xlsx'
-    
     # Load and clean data
-    data_analyzer = DataAnalyzer(file_path)
+    data_analyzer = DataAnalyzer()
     clean_data = data_analyzer.clean_data
 
     # Streamlit App
@@ -143,33 +177,25 @@ def main():
     # Section 3: Total Killed and Injured Visualization
     st.header('Total Killed and Injured Over Time')
     visualizer = DataVisualizer(clean_data)
-    fig_killed_injured = visualizer.plot_killed_and_injured()
-    st.pyplot(fig_killed_injured)
+    fingerprint = frame_fingerprint(clean_data)
+    pyplot('escalation.killed_and_injured', fingerprint, visualizer.plot_killed_and_injured)
 
     # Section 4: Total Killed by Gender Visualization
     st.header('Total Killed by Gender')
-    gender_killed_totals = {
-        'Killed Female': summary_stats['killed_female_total'],
-        'Killed Male': summary_stats['killed_male_total'],
-        'Killed Undefined': summary_stats['killed_undefined_total']
-    }
-    fig_killed_gender = visualizer.plot_killed_by_gender(gender_killed_totals)
-    st.pyplot(fig_killed_gender)
+    pyplot('escalation.killed_by_gender', fingerprint,
+           lambda: visualizer.plot_killed_by_gender(gender_killed_totals(summary_stats)))
 
     # Section 5: Injured and Displaced Over Time
     st.header('Injured and Displaced Over Time')
-    fig_injured_displaced = visualizer.plot_injured_and_displaced()
-    st.pyplot(fig_injured_displaced)
+    pyplot('escalation.injured_and_displaced', fingerprint, visualizer.plot_injured_and_displaced)
 
     # Section 6: Damaged Housing Units Over Time
     st.header('Damaged Housing Units Over Time')
-    fig_damaged_housing = visualizer.plot_damaged_housing_units()
-    st.pyplot(fig_damaged_housing)
+    pyplot('escalation.damaged_housing_units', fingerprint, visualizer.plot_damaged_housing_units)
 
     # Section 7: Total Displaced People Over Time
     st.header('Total Number of Displaced People Over Time')
-    fig_total_displaced = visualizer.plot_total_displaced()
-    st.pyplot(fig_total_displaced)
+    pyplot('escalation.total_displaced', fingerprint, visualizer.plot_total_displaced)
 
     # Section 8: Insights
     st.header('Key Insights')
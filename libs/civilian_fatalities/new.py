@@ -3,8 +3,10 @@ import chardet
 import sys
 sys.path.append('../')
 
+from libs.common.catalog import dataset_path
+
 # Detect encoding
 
-with open(r'/home/marktine/data Vis/Isreal_x_Hamas-BI-/libs/misic/data-points/spreadsheets/xslx/palestine_hrp_civilian_targeting_events_and_fatalities_by_month-year_as-of-29may2024.xlsx', 'rb') as f:
+with open(dataset_path('civilian_targeting'), 'rb') as f:
     result = chardet.detect(f.read())
     print(result)
\ No newline at end of file
@@ -0,0 +1,151 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.dataset_store import frame_fingerprint
+
+# The workbook's two opening price columns are averages before and after
+# 7 October 2023; they stand for September and October. Later releases add one
+# column per month, named like 'Nov-23' by the catalog cleaning step.
+PRICE_BEFORE = 'Price-7th October'
+PRICE_AFTER = 'average price after 7 October 2023'
+MONTH_FORMAT = '%b-%y'
+
+
+def month_columns(columns):
+    """Price columns in chronological order as ``[(month label, column), ...]``."""
+    columns = pd.Index(columns)
+    parsed = pd.to_datetime(pd.Series(columns.astype(str)), format=MONTH_FORMAT, errors='coerce')
+    months = [(date, column) for date, column in zip(parsed, columns) if not pd.isna(date)]
+    months.sort(key=lambda item: item[0])
+    opening = [column for column in (PRICE_BEFORE, PRICE_AFTER) if column in columns]
+    start = (months[0][0] if months else pd.Timestamp('2023-11-01')) - pd.DateOffset(months=len(opening))
+    opening = [(start + pd.DateOffset(months=i), column) for i, column in enumerate(opening)]
+    return [(date.strftime(MONTH_FORMAT), column) for date, column in opening + months]
+
+
+def _percent_change(new, old):
+    """``(new - old) / old`` in percent; NaN where the old price is missing or zero."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (new - old) / old * 100
+    return np.where(np.isfinite(change), change, np.nan)
+
+
+def _descending_rank(values):
+    """1 for the largest value; NaN values rank last."""
+    order = np.argsort(np.where(np.isnan(values), -np.inf, values), kind='stable')[::-1]
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(1, len(values) + 1)
+    return ranks
+
+
+class CommodityPrices:
+    """Commodity x month price matrix with vectorised period-over-period analytics.
+
+    The wide workbook is reshaped once into a ``(commodities, months)`` float
+    array; every change, volatility and rank is computed on whole arrays, so
+    the cost does not depend on how many months a release adds.
+    """
+
+    def __init__(self, df):
+        columns = month_columns(df.columns)
+        self.months = [label for label, _ in columns]
+        self.names = df['Commodity Name'].astype(str).to_numpy()
+        self.amounts = df['Amount'].astype(str).to_numpy()
+        self.prices = df[[column for _, column in columns]].to_numpy(dtype=np.float64)
+        self.prices.flags.writeable = False
+        self.since_october = int(PRICE_BEFORE in df.columns)  # first column after 7 October 2023
+
+    @property
+    def periods(self):
+        """Labels of the month-over-month periods, e.g. ``'Sep-23 to Oct-23'``."""
+        return [f'{old} to {new}' for old, new in zip(self.months[:-1], self.months[1:])]
+
+    def monthly_changes(self):
+        """Percent change of every commodity between consecutive months, ``(commodities, months - 1)``."""
+        return _percent_change(self.prices[:, 1:], self.prices[:, :-1])
+
+    def _first_and_last(self):
+        """First and last reported price of every commodity, skipping gaps."""
+        known = ~np.isnan(self.prices)
+        rows = np.arange(len(self.prices))
+        first = self.prices[rows, known.argmax(axis=1)]
+        last = self.prices[rows, known.shape[1] - 1 - known[:, ::-1].argmax(axis=1)]
+        return first, last
+
+    def cumulative_change(self):
+        """Percent change from the first to the last reported price of every commodity."""
+        first, last = self._first_and_last()
+        return _percent_change(last, first)
+
+    def volatility(self):
+        """Standard deviation of the monthly prices since 7 October 2023."""
+        prices = self.prices[:, self.since_october:]
+        counts = np.sum(~np.isnan(prices), axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.nansum(prices, axis=1) / counts
+            variance = np.nansum((prices - mean[:, None]) ** 2, axis=1) / (counts - 1)
+        return np.where(counts > 1, np.sqrt(variance), np.nan)
+
+    def long(self):
+        """Long ``Commodity Name, Month, Price`` frame."""
+        n_commodities, n_months = self.prices.shape
+        return pd.DataFrame({
+            'Commodity Name': np.repeat(self.names, n_months),
+            'Month': np.tile(self.months, n_commodities),
+            'Price': self.prices.ravel(),
+        })
+
+    def price_change_data(self):
+        """Long ``Commodity Name, Period, Percent Change`` frame for every month-over-month period."""
+        changes = self.monthly_changes()
+        n_commodities, n_periods = changes.shape
+        return pd.DataFrame({
+            'Commodity Name': np.repeat(self.names, n_periods),
+            'Period': pd.Categorical.from_codes(np.tile(np.arange(n_periods), n_commodities), self.periods, ordered=True),
+            'Percent Change': changes.ravel(),
+        })
+
+    def summary(self):
+        """One row per commodity with its cumulative change, volatility and both ranks."""
+        cumulative = self.cumulative_change()
+        volatility = self.volatility()
+        return pd.DataFrame({
+            'Commodity Name': self.names,
+            'Amount': self.amounts,
+            'Cumulative Change': cumulative,
+            'Cumulative Rank': _descending_rank(cumulative),
+            'Price Volatility': volatility,
+            'Volatility Rank': _descending_rank(volatility),
+        })
+
+    def top(self, measure, n=10):
+        """The ``n`` commodities ranking highest on ``'Cumulative Change'`` or ``'Price Volatility'``."""
+        rank = {'Cumulative Change': 'Cumulative Rank', 'Price Volatility': 'Volatility Rank'}[measure]
+        summary = self.summary()
+        return summary[summary[rank] <= n].sort_values(rank).reset_index(drop=True)
+
+
+_analytics = OrderedDict()
+_analytics_lock = threading.Lock()
+_MAX_ANALYTICS = 8
+
+
+def prices_for(df):
+    """Return the price analytics of a commodity dataset version, building them once."""
+    key = frame_fingerprint(df)
+    with _analytics_lock:
+        prices = _analytics.get(key)
+        if prices is None:
+            prices = CommodityPrices(df)
+            _analytics[key] = prices
+            while len(_analytics) > _MAX_ANALYTICS:
+                _analytics.popitem(last=False)
+        else:
+            _analytics.move_to_end(key)
+        return prices
@@ -0,0 +1,70 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.benchmark import run_suite, time_call, time_render
+from libs.common.catalog import read_dataset
+from libs.commodity_market.analytics import MONTH_FORMAT, PRICE_AFTER, PRICE_BEFORE, CommodityPrices
+from libs.commodity_market.commodity_market import REPORT_CHARTS, CommodityDashboard
+
+DEFAULT_SIZES = ['1000x60', '5000x500']
+MAX_MONTHS = 542  # 'Nov-23' style labels are unambiguous up to Dec-68
+
+
+def synthetic_commodity_data(n_commodities, n_months, seed=0):
+    """A cleaned-workbook shaped frame of random-walk prices for ``n_commodities`` over ``n_months``.
+
+    The first two months are the workbook's before/after 7 October columns;
+    the rest are monthly columns from November 2023 on.
+    """
+    if n_months > MAX_MONTHS:
+        raise ValueError(f"at most {MAX_MONTHS} months fit two-digit-year month labels")
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.02, 0.15, size=(n_commodities, n_months))
+    prices = np.exp(np.log(rng.uniform(1, 100, size=(n_commodities, 1))) + np.cumsum(steps, axis=1))
+    months = pd.date_range('2023-11-01', periods=n_months - 2, freq='MS').strftime(MONTH_FORMAT)
+    df = pd.DataFrame(prices, columns=[PRICE_BEFORE, PRICE_AFTER] + list(months))
+    df.insert(0, 'Commodity Name', pd.Categorical([f'commodity {i}' for i in range(n_commodities)]))
+    df.insert(1, 'Amount', pd.Categorical(rng.choice(['1 kg', '5 kg', '1 liter', 'unit'], n_commodities)))
+    return df
+
+
+def transform(df):
+    """Everything the page derives from the frame before plotting."""
+    prices = CommodityPrices(df)
+    prices.price_change_data()
+    prices.summary()
+    return prices
+
+
+def benchmark(df, repeat=1, load=None):
+    """Time load (when given), transform and every chart's render for one frame."""
+    phases = {}
+    if load is not None:
+        phases['load'], df = time_call(load, repeat)
+    phases['transform'] = time_call(lambda: transform(df), repeat)[0]
+    dashboard = CommodityDashboard(df)
+    for chart_id, _, method in REPORT_CHARTS:
+        phases[f'render:{chart_id}'] = time_render(getattr(dashboard, method), repeat)
+    return phases
+
+
+def run(args):
+    results = {'commodity[workbook]': benchmark(None, args.repeat, load=lambda: read_dataset('commodity_prices'))}
+    for size in args.sizes:
+        n_commodities, n_months = (int(value) for value in size.split('x'))
+        results[f'commodity[{size}]'] = benchmark(synthetic_commodity_data(n_commodities, n_months), args.repeat)
+    return results
+
+
+def add_arguments(parser):
+    parser.add_argument('--sizes', nargs='*', default=DEFAULT_SIZES,
+                        help="synthetic datasets as COMMODITIESxMONTHS (default: %(default)s)")
+
+
+if __name__ == '__main__':
+    sys.exit(run_suite("Time loading, transforming and rendering the commodity page.", run,
+                       add_arguments=add_arguments))
@@ -0,0 +1,156 @@
+import streamlit as st
+import pandas as pd
+import seaborn as sns
+import sys
+sys.path.append('../')
+
+from libs.common.catalog import load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.figures import new_figure, rotate_xticks
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import pyplot
+from libs.commodity_market.analytics import MONTH_FORMAT, PRICE_AFTER, PRICE_BEFORE, prices_for
+
+
+def load_commodity_data():
+    """Return the cleaned commodity prices from the dataset catalog."""
+    return load('commodity_prices')
+
+
+def clean_commodity_data(commodity_data):
+    """Catalog cleaning step: drop the Arabic columns and give the price columns readable names.
+
+    Monthly price columns (datetime headers) become ``'Nov-23'`` style labels, so
+    releases that add months need no code change.
+    """
+    commodity_data = commodity_data.drop(columns=['Unnamed: 0', 'commodity name (arabic)', 'amount (arabic)'])
+    commodity_data['commodity name (english)'] = commodity_data['commodity name (english)'].str.replace(r'\(.*\)', '', regex=True).str.strip()
+    names = {'commodity name (english)': 'Commodity Name', 'amount (english)': 'Amount',
+             'average price before 7 October 2023': PRICE_BEFORE}
+    commodity_data.columns = [column.strftime(MONTH_FORMAT) if hasattr(column, 'strftime') else names.get(column, column)
+                              for column in commodity_data.columns]
+    return commodity_data
+
+
+def derived_caches(df):
+    """Price analytics of a dataset version, built once and shared."""
+    return prices_for(df)
+
+
+@instrument_methods()
+class CommodityDashboard:
+    def __init__(self, df=None):
+        self.df = load_commodity_data() if df is None else df  # Shared read-only view from the dataset store
+        self.fingerprint = frame_fingerprint(self.df)
+        self.prices = derived_caches(self.df)  # Built once per dataset version
+
+    def display_introduction(self):
+        st.header("Commodity Market Analysis")
+        st.write("This analysis provides insights into the commodity market trends in Gaza during the Israel-Hamas conflict.")
+
+    def plot_initial_prices(self):
+        """Plot the average price of every commodity right after 7 October 2023."""
+        st.subheader("Initial Commodity Prices")
+        pyplot('commodity.initial_prices', self.fingerprint, self.initial_prices_figure)
+        st.write("This chart shows the average prices of commodities immediately after October 7, 2023. We can observe significant variations in prices across different commodities, which may reflect their availability and demand during the conflict.")
+
+    def initial_prices_figure(self):
+        """Build the initial prices bar chart."""
+        average_prices = self.df.groupby('Commodity Name', observed=True)[PRICE_AFTER].mean()
+        fig, ax = new_figure(figsize=(20, 10))
+        average_prices.plot(kind='bar', color='skyblue', ax=ax)
+        ax.set_title('Initial Commodity Prices after October 7, 2023')
+        ax.set_xlabel('Commodity')
+        ax.set_ylabel('Average Price')
+        rotate_xticks(ax, 90)
+        ax.grid(axis='y')
+        return fig
+
+    def plot_price_changes(self):
+        """Plot the distribution of month-over-month price changes."""
+        st.subheader("Price Change Analysis")
+        pyplot('commodity.price_changes', self.fingerprint, self.price_changes_figure)
+        st.write("This box plot illustrates the distribution of price changes for all commodities over different time periods. The wide range of price changes, especially in the initial months, reflects the market's volatility during the conflict.")
+
+    def price_changes_figure(self):
+        """Build the price change box plot."""
+        fig, ax = new_figure(figsize=(15, 8))
+        sns.boxplot(x='Period', y='Percent Change', data=self.prices.price_change_data(), ax=ax)
+        ax.set_title('Distribution of Price Changes Over Time')
+        ax.set_xlabel('Time Period')
+        ax.set_ylabel('Percent Change')
+        rotate_xticks(ax, 45)
+        return fig
+
+    def top(self, measure, n=10):
+        """The top ``n`` commodities on ``measure``, in rank order on seaborn's categorical axis."""
+        top = self.prices.top(measure, n)
+        top['Commodity Name'] = pd.Categorical(top['Commodity Name'], categories=top['Commodity Name'].unique())
+        return top
+
+    def plot_volatility(self):
+        """Plot the most volatile commodities."""
+        st.subheader("Most Volatile Commodities")
+        pyplot('commodity.volatility', self.fingerprint, self.volatility_figure)
+        st.write("This chart shows the commodities with the highest price volatility. These items experienced the most significant price fluctuations, likely due to supply chain disruptions, changes in demand, or other conflict-related factors.")
+
+    def volatility_figure(self):
+        """Build the top 10 volatility bar chart."""
+        fig, ax = new_figure(figsize=(12, 6))
+        sns.barplot(x='Price Volatility', y='Commodity Name', data=self.top('Price Volatility'), ax=ax)
+        ax.set_title('Top 10 Most Volatile Commodities')
+        ax.set_xlabel('Price Volatility (Standard Deviation)')
+        ax.set_ylabel('Commodity')
+        return fig
+
+    def plot_cumulative_change(self):
+        """Plot the commodities with the largest cumulative price change."""
+        st.subheader("Cumulative Price Change")
+        pyplot('commodity.cumulative_change', self.fingerprint, self.cumulative_change_figure)
+        st.write("This chart displays the commodities with the highest cumulative price changes. These items have seen the most significant overall increase in price since the start of the conflict, indicating severe supply issues or increased demand.")
+
+    def cumulative_change_figure(self):
+        """Build the top 10 cumulative change bar chart."""
+        fig, ax = new_figure(figsize=(12, 6))
+        sns.barplot(x='Cumulative Change', y='Commodity Name', data=self.top('Cumulative Change'), ax=ax)
+        ax.set_title('Top 10 Commodities by Cumulative Price Change')
+        ax.set_xlabel('Cumulative Price Change (%)')
+        ax.set_ylabel('Commodity')
+        return fig
+
+    def display_takeaways(self):
+        st.subheader("Key Takeaways")
+        st.write("1. The conflict has led to significant volatility in commodity prices, with some items experiencing extreme fluctuations.")
+        st.write("2. Certain commodities have seen substantial cumulative price increases, potentially making them unaffordable for many residents.")
+        st.write("3. The initial months of the conflict saw the most dramatic price changes, likely due to immediate supply chain disruptions and panic buying.")
+        st.write("4. Essential items like food and fuel appear to be among the most affected, which could have severe implications for the population's well-being.")
+        st.write("5. The ongoing volatility in prices suggests that the market has not stabilized, indicating continued challenges in supply and distribution.")
+
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('commodity.initial_prices', 'Initial Commodity Prices', 'initial_prices_figure'),
+    ('commodity.price_changes', 'Price Change Analysis', 'price_changes_figure'),
+    ('commodity.volatility', 'Most Volatile Commodities', 'volatility_figure'),
+    ('commodity.cumulative_change', 'Cumulative Price Change', 'cumulative_change_figure'),
+]
+
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(CommodityDashboard(), builder)()
+
+
+def cmmain():
+    dashboard = CommodityDashboard()
+    dashboard.display_introduction()
+    dashboard.plot_initial_prices()
+    dashboard.plot_price_changes()
+    dashboard.plot_volatility()
+    dashboard.plot_cumulative_change()
+    dashboard.display_takeaways()
+
+
+if __name__ == "__main__":
+    cmmain()
@@ -0,0 +1,133 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.dataset_store import frame_fingerprint
+
+DIMENSIONS = ('Year', 'Month', 'Admin1', 'Admin2')
+MEASURES = ('Events', 'Fatalities')
+
+
+class AggregateCube:
+    """Dense Year x Month x Admin1 x Admin2 cube of measure sums and row counts.
+
+    The cube is built with a single pass over the raw rows. Every chart query
+    afterwards slices and sums the cube, so its cost depends on the number of
+    distinct dimension values, not on the number of rows.
+    """
+
+    def __init__(self, df, dimensions=DIMENSIONS, measures=MEASURES):
+        self.dimensions = tuple(dimensions)
+        self.measures = tuple(measures)
+        self.axes = {}
+        codes = []
+        for dim in self.dimensions:
+            dim_codes, labels = pd.factorize(df[dim], sort=True)
+            codes.append(dim_codes)
+            self.axes[dim] = pd.Index(labels, name=dim)
+        self.shape = tuple(len(self.axes[dim]) for dim in self.dimensions)
+        size = int(np.prod(self.shape))
+        # Rows missing any dimension value get code -1; skip them like groupby does.
+        complete = np.all([dim_codes >= 0 for dim_codes in codes], axis=0) if codes else np.ones(len(df), bool)
+        codes = [dim_codes[complete] for dim_codes in codes]
+        flat = np.ravel_multi_index(codes, self.shape) if complete.any() else np.zeros(0, dtype=np.intp)
+
+        self.counts = np.bincount(flat, minlength=size).reshape(self.shape)
+        self.sums = {}
+        self.integer_measures = set()
+        for measure in self.measures:
+            values = np.nan_to_num(df[measure].to_numpy(dtype='float64')[complete])
+            self.sums[measure] = np.bincount(flat, weights=values, minlength=size).reshape(self.shape)
+            if pd.api.types.is_integer_dtype(df[measure]):
+                self.integer_measures.add(measure)
+
+    def _positions(self, filters):
+        """Axis positions selected by ``filters`` ({dimension: allowed labels})."""
+        positions = []
+        for dim in self.dimensions:
+            axis = self.axes[dim]
+            allowed = (filters or {}).get(dim)
+            if allowed is None:
+                positions.append(np.arange(len(axis)))
+            else:
+                positions.append(np.flatnonzero(axis.isin(list(allowed))))
+        return positions
+
+    def rollup(self, by, filters=None):
+        """Sum the cube onto the ``by`` dimensions after applying ``filters``.
+
+        Returns a frame indexed by the populated combinations of ``by`` with one
+        column per measure (sum) and a ``rows`` column (number of source rows).
+        """
+        by = list(by)
+        positions = self._positions(filters)
+        selector = np.ix_(*positions)
+        kept = [self.dimensions.index(dim) for dim in by]
+        dropped = tuple(i for i in range(len(self.dimensions)) if i not in kept)
+        # Remaining axes are in cube order; reorder them to match ``by``.
+        order = np.argsort(np.argsort(kept))
+
+        def reduce(array):
+            return np.transpose(array[selector].sum(axis=dropped), order).ravel()
+
+        index = pd.MultiIndex.from_product(
+            [self.axes[dim][positions[i]] for dim, i in zip(by, kept)], names=by)
+        result = pd.DataFrame({'rows': reduce(self.counts)}, index=index)
+        for measure in self.measures:
+            values = reduce(self.sums[measure])
+            if measure in self.integer_measures:
+                values = np.rint(values).astype('int64')
+            result[measure] = values
+        result = result[result['rows'] > 0]
+        if len(by) == 1:
+            result.index = result.index.get_level_values(0)
+        return result
+
+    def yearly_metrics(self, filters=None):
+        """Totals and per-row means by year, in the shape of a groupby('Year').agg()."""
+        yearly = self.rollup(['Year'], filters)
+        return pd.DataFrame({
+            'Year': yearly.index,
+            'total_events': yearly['Events'].to_numpy(),
+            'total_fatalities': yearly['Fatalities'].to_numpy(),
+            'avg_events': (yearly['Events'] / yearly['rows']).to_numpy(),
+            'avg_fatalities': (yearly['Fatalities'] / yearly['rows']).to_numpy(),
+        })
+
+    def month_of_year_totals(self, measure, filters=None):
+        """Totals per 'Mon-YY' label, sorted by label like the month_of_year column."""
+        monthly = self.rollup(['Year', 'Month'], filters).reset_index()
+        monthly['month_of_year'] = (monthly['Month'].astype(str).str[:3] + '-'
+                                    + monthly['Year'].astype(str).str[-2:])
+        totals = monthly.groupby('month_of_year')[measure].sum().reset_index()
+        return totals.sort_values('month_of_year')
+
+    def pivot(self, measure, index, columns, filters=None):
+        """``index`` x ``columns`` table of ``measure`` sums, like pivot_table(fill_value=0)."""
+        table = self.rollup([index, columns], filters)[measure]
+        return table.unstack(columns, fill_value=0)
+
+
+_cubes = OrderedDict()
+_cubes_lock = threading.Lock()
+_MAX_CUBES = 16
+
+
+def cube_for(name, df, dimensions=DIMENSIONS, measures=MEASURES):
+    """Return the cube for dataset ``name``, building it once per dataset version."""
+    key = (name, frame_fingerprint(df), tuple(dimensions), tuple(measures))
+    with _cubes_lock:
+        cube = _cubes.get(key)
+        if cube is None:
+            cube = AggregateCube(df, dimensions, measures)
+            _cubes[key] = cube
+            while len(_cubes) > _MAX_CUBES:
+                _cubes.popitem(last=False)
+        else:
+            _cubes.move_to_end(key)
+        return cube
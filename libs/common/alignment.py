@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+sys.path.append('../')
+
+from libs.common.catalog import load
+from libs.common.columnar_cache import CACHE_DIR, file_hash
+from libs.common.dataset_store import frame_fingerprint
+from libs.commodity_market.analytics import MONTH_FORMAT, prices_for
+
+CROSSWALK_PATH = Path(os.environ.get('DASHBOARD_CROSSWALK', Path(__file__).with_name('regions.json')))
+PANEL_DIR = CACHE_DIR / 'panels'
+PANEL_VERSION = 1  # bump when the sources or the panel layout change
+KEY_COLUMNS = ['level', 'admin1', 'region', 'month']
+LEVELS = ('admin1', 'admin2')
+MIN_PERIODS = 6   # months two measures must share before a correlation is shown
+MAX_LAG = 6       # months
+
+_UNMATCHED_KEY = b'dashboard.unmatched_labels'
+
+
+def _months(dates):
+    """First day of the month of each date."""
+    return pd.to_datetime(dates).dt.to_period('M').dt.to_timestamp()
+
+
+# Each source turns one dataset into rows of (month, region label, measures...),
+# one row per month and label. Labels are mapped through the crosswalk afterwards.
+
+def _health_incidents(df):
+    frame = pd.DataFrame({
+        'month': _months(df['Date']),
+        'label': df['Admin 1'].astype(str),
+        'health_incidents': 1,
+        'health_workers_killed': pd.to_numeric(df['Health Workers Killed'], errors='coerce'),
+    })
+    return frame.groupby(['month', 'label'], as_index=False).sum(min_count=1)
+
+
+def _acled(prefix):
+    def source(df):
+        frame = pd.DataFrame({
+            'month': pd.to_datetime(df['Month'].astype(str) + ' ' + df['Year'].astype(str), format='%B %Y'),
+            'label': df['Admin2'].astype(str),
+            f'{prefix}_events': df['Events'].astype('float64'),
+            f'{prefix}_fatalities': df['Fatalities'].astype('float64'),
+        })
+        return frame.groupby(['month', 'label'], as_index=False).sum(min_count=1)
+    return source
+
+
+def _displacement(df):
+    """Yearly demolitions, spread evenly over the twelve months of each year."""
+    rows = df.loc[df.index.repeat(12)]
+    frame = pd.DataFrame({
+        'month': pd.to_datetime(pd.DataFrame({'year': rows['Year'].to_numpy(),
+                                              'month': np.tile(np.arange(1, 13), len(df)), 'day': 1})),
+        'label': rows['Governorate'].astype(str).to_numpy(),
+        'demolished_structures': rows['Demolished Structures'].to_numpy(dtype='float64') / 12,
+        'demolition_idps': rows['IDPs'].to_numpy(dtype='float64') / 12,
+    })
+    return frame.groupby(['month', 'label'], as_index=False).sum(min_count=1)
+
+
+def _gaza_idps(df):
+    """Mean daily IDPs at shelters per month."""
+    frame = pd.DataFrame({
+        'month': _months(df['Date']),
+        'label': df['Governorate'].astype(str),
+        'idps_at_shelters': df['IDPs at Shelters'].astype('float64'),
+    })
+    return frame.groupby(['month', 'label'], as_index=False).mean()
+
+
+def _commodity_prices(df):
+    """Geometric mean price relative to the month before 7 October, times 100."""
+    prices = prices_for(df)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relative = np.log(prices.prices / prices.prices[:, :1])
+    relative[~np.isfinite(relative)] = np.nan
+    counted = np.isfinite(relative).sum(axis=0)
+    index = np.exp(np.nansum(relative, axis=0) / np.maximum(counted, 1)) * 100
+    return pd.DataFrame({
+        'month': pd.to_datetime(prices.months, format=MONTH_FORMAT),
+        'label': 'Gaza Strip',
+        'commodity_price_index': np.where(counted > 0, index, np.nan),
+    })
+
+
+def _escalation_impact(df):
+    """Monthly increase of the cumulative killed and injured counts."""
+    cumulative = df.groupby(_months(df['date']))[['killed total', 'injured']].max()
+    monthly = cumulative.diff().fillna(cumulative)
+    return pd.DataFrame({
+        'month': monthly.index,
+        'label': 'Gaza Strip',
+        'escalation_killed': monthly['killed total'].to_numpy(dtype='float64'),
+        'escalation_injured': monthly['injured'].to_numpy(dtype='float64'),
+    })
+
+
+# (dataset, source) in the order their measures appear in the panel
+SOURCES = [
+    ('health_care_incidents', _health_incidents),
+    ('civilian_targeting', _acled('civilian_targeting')),
+    ('political_violence', _acled('political_violence')),
+    ('displacement_by_year', _displacement),
+    ('gaza_idps', _gaza_idps),
+    ('commodity_prices', _commodity_prices),
+    ('escalation_impact', _escalation_impact),
+]
+DATASETS = [dataset for dataset, _ in SOURCES]
+
+_crosswalk = None
+_crosswalk_lock = threading.Lock()
+
+
+def crosswalk():
+    """Region label -> (admin1, region, level) for every name and alias in the crosswalk file."""
+    global _crosswalk
+    with _crosswalk_lock:
+        if _crosswalk is None:
+            spec = json.loads(CROSSWALK_PATH.read_text(encoding='utf-8'))
+            rows = {}
+            for admin1, governorates in spec['regions'].items():
+                rows[admin1] = (admin1, admin1, 'admin1')
+                for admin2 in governorates:
+                    rows[admin2] = (admin1, admin2, 'admin2')
+            for alias, name in spec['aliases'].items():
+                rows[alias] = rows[name]
+            _crosswalk = pd.DataFrame.from_dict(rows, orient='index', columns=['admin1', 'region', 'level'])
+        return _crosswalk
+
+
+def regions(level):
+    """``[(admin1, region), ...]`` of one level of the crosswalk."""
+    walk = crosswalk()
+    return list(walk[walk['level'] == level][['admin1', 'region']].drop_duplicates().itertuples(index=False))
+
+
+def build_panel(frames):
+    """Align ``{dataset: frame}`` onto one month x region table at both admin levels.
+
+    Returns the panel (``KEY_COLUMNS`` plus one column per measure, every
+    region on every month between the first and last month of any source) and
+    the region labels each dataset used that the crosswalk does not know.
+    A measure its source reports for a whole admin 1 area is taken as is;
+    otherwise the admin 1 value is the sum of its governorates.
+    """
+    walk = crosswalk()
+    aligned, unmatched = [], {}
+    for dataset, source in SOURCES:
+        rows = source(frames[dataset])
+        known = rows['label'].isin(walk.index)
+        unmatched[dataset] = sorted(rows.loc[~known, 'label'].unique())
+        rows = rows[known].join(walk, on='label').drop(columns='label')
+        aligned.append(rows.groupby(KEY_COLUMNS).sum(min_count=1))
+    long = pd.concat(aligned, axis=1)
+    measures = list(long.columns)
+
+    admin2 = long.xs('admin2', level='level')
+    reported = long.xs('admin1', level='level').droplevel('region')
+    rolled_up = admin2.groupby(level=['admin1', 'month']).sum(min_count=1)
+    index = reported.index.union(rolled_up.index)
+    reported, rolled_up = reported.reindex(index), rolled_up.reindex(index)
+    admin1 = pd.DataFrame({measure: reported[measure] if reported[measure].notna().any() else rolled_up[measure]
+                           for measure in measures}, index=index)
+    admin1['region'] = admin1.index.get_level_values('admin1')
+    admin1 = admin1.set_index('region', append=True).reorder_levels(['admin1', 'region', 'month'])
+
+    months = long.index.get_level_values('month')
+    calendar = pd.date_range(months.min(), months.max(), freq='MS')
+    panels = []
+    for level, values in (('admin1', admin1), ('admin2', admin2)):
+        grid = pd.MultiIndex.from_tuples([(a1, region, month) for a1, region in regions(level) for month in calendar],
+                                         names=['admin1', 'region', 'month'])
+        panel = values.reindex(grid).reset_index()
+        panel.insert(0, 'level', level)
+        panels.append(panel)
+    panel = pd.concat(panels, ignore_index=True)[KEY_COLUMNS + measures]
+    return panel, unmatched
+
+
+def _panel_key(frames):
+    versions = {dataset: frame_fingerprint(df) for dataset, df in frames.items()}
+    versions['crosswalk'] = file_hash(CROSSWALK_PATH)
+    versions['version'] = PANEL_VERSION
+    return hashlib.sha256(json.dumps(versions, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _write_panel(path, panel, unmatched):
+    table = pa.Table.from_pandas(panel, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_UNMATCHED_KEY] = json.dumps(unmatched).encode()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    feather.write_feather(table.replace_schema_metadata(metadata), str(tmp))
+    os.replace(tmp, path)
+
+
+def _read_panel(path):
+    table = feather.read_table(str(path), memory_map=True)
+    unmatched = json.loads((table.schema.metadata or {}).get(_UNMATCHED_KEY, b'{}'))
+    return table.to_pandas(), unmatched
+
+
+_panels = OrderedDict()
+_panels_lock = threading.Lock()
+_MAX_PANELS = 4
+
+
+def panel_for(frames=None):
+    """The aligned panel of the given (default: currently served) dataset versions.
+
+    Built once per combination of versions and persisted under ``PANEL_DIR``;
+    later processes read the columnar file instead of joining the datasets.
+    The panel's ``source_hash`` identifies that combination, and
+    ``attrs['unmatched']`` lists region labels left out.
+    """
+    if frames is None:
+        frames = {dataset: load(dataset) for dataset in DATASETS}
+    key = _panel_key(frames)
+    with _panels_lock:
+        panel = _panels.get(key)
+        if panel is None:
+            path = PANEL_DIR / f'panel-{key}.arrow'
+            if path.exists():
+                panel, unmatched = _read_panel(path)
+            else:
+                panel, unmatched = build_panel(frames)
+                _write_panel(path, panel, unmatched)
+            panel.attrs['source_hash'] = key
+            panel.attrs['unmatched'] = unmatched
+            _panels[key] = panel
+            while len(_panels) > _MAX_PANELS:
+                _panels.popitem(last=False)
+        else:
+            _panels.move_to_end(key)
+        return panel
+
+
+def measures(panel):
+    return [column for column in panel.columns if column not in KEY_COLUMNS]
+
+
+def level_rows(panel, level, region=None):
+    """Rows of one admin level (and region), ordered by region and month."""
+    rows = panel[panel['level'] == level]
+    if region is not None:
+        rows = rows[rows['region'] == region]
+    return rows
+
+
+def measures_at(panel, level, region=None):
+    """Measures with data at ``level`` (in ``region``)."""
+    rows = level_rows(panel, level, region)
+    return [measure for measure in measures(panel) if rows[measure].notna().any()]
+
+
+def correlations(panel, level, region=None, columns=None, min_periods=MIN_PERIODS):
+    """Pearson correlations between measures over region-months; NaN where fewer than ``min_periods`` overlap."""
+    rows = level_rows(panel, level, region)
+    columns = columns or measures_at(panel, level, region)
+    return rows[columns].corr(min_periods=min_periods)
+
+
+def lag_correlations(panel, leader, follower, level, region=None, max_lag=MAX_LAG, min_periods=MIN_PERIODS):
+    """Correlation of ``leader`` in month t with ``follower`` in month t + lag, for lag in ``[-max_lag, max_lag]``.
+
+    Lags shift within each region, so months never cross between regions.
+    """
+    rows = level_rows(panel, level, region)
+    by_region = rows.groupby('region', sort=False)[follower]
+    lags = range(-max_lag, max_lag + 1)
+    values = [rows[leader].corr(by_region.shift(-lag), min_periods=min_periods) for lag in lags]
+    return pd.Series(values, index=pd.Index(lags, name='lag'), name='correlation')
@@ -0,0 +1,199 @@
+import argparse
+import functools
+import inspect
+import json
+import platform
+import sys
+import time
+import types
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append('../')
+
+from libs.common.figures import release
+from libs.common.plotly_payload import figure_payload
+from libs.common.render_cache import figure_to_png
+
+DEFAULT_TOLERANCE = 1.5   # a phase regresses when it takes this many times its baseline...
+DEFAULT_FLOOR = 0.05      # ...and at least this many seconds longer
+
+
+def time_call(fn, repeat=1):
+    """Best wall time of ``repeat`` calls of ``fn()`` and the last result."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, result
+
+
+def render(build_figure):
+    """Build a chart and turn it into what the browser receives (PNG or Plotly JSON bytes)."""
+    fig = build_figure()
+    if hasattr(fig, 'to_json'):
+        return figure_payload(fig)
+    try:
+        return figure_to_png(fig)
+    finally:
+        release(fig)
+
+
+def time_render(build_figure, repeat=1):
+    """Time ``render(build_figure)``."""
+    return time_call(lambda: render(build_figure), repeat)[0]
+
+
+def _plotting_entry_points():
+    """``(owner, attribute)`` of the plotting-library calls a chart builder makes."""
+    import matplotlib.axes
+    import matplotlib.figure
+    import pandas.plotting
+    import plotly.basedatatypes
+    import plotly.express
+    import seaborn
+
+    points = [(pandas.plotting.PlotAccessor, '__call__'), (matplotlib.figure.Figure, '__init__'),
+              (plotly.basedatatypes.BaseFigure, '__init__')]
+    for owner in (matplotlib.axes.Axes, matplotlib.figure.Figure, plotly.basedatatypes.BaseFigure, plotly.express,
+                  seaborn):
+        for name in dir(owner):
+            if name.startswith('_') or not isinstance(inspect.getattr_static(owner, name), types.FunctionType):
+                continue
+            # Patch where the method is defined: matplotlib compares methods with their base-class version
+            defining = next((cls for cls in getattr(owner, '__mro__', ()) if name in vars(cls)), owner)
+            points.append((defining, name))
+    return list(dict.fromkeys(points))
+
+
+class _Clock:
+    seconds = 0.0
+    depth = 0
+
+
+@contextmanager
+def plotting_clock():
+    """Count the wall time spent inside matplotlib, seaborn, pandas plotting and Plotly calls.
+
+    Only the outermost call is timed, so ``px.bar`` building a ``go.Figure``
+    counts once. Single-threaded use only.
+    """
+    clock = _Clock()
+
+    def timed(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if clock.depth:
+                return fn(*args, **kwargs)
+            clock.depth += 1
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                clock.seconds += time.perf_counter() - start
+                clock.depth -= 1
+        return wrapper
+
+    patched = [(owner, name, vars(owner)[name]) for owner, name in _plotting_entry_points()]
+    for owner, name, original in patched:
+        setattr(owner, name, timed(original))
+    try:
+        yield clock
+    finally:
+        for owner, name, original in patched:
+            setattr(owner, name, original)
+
+
+def time_chart(build_figure, repeat=1):
+    """Best ``(transform, render)`` seconds of ``repeat`` runs of a chart.
+
+    ``transform`` is the builder's own work (filtering, grouping, reshaping);
+    ``render`` is the time in plotting-library calls plus turning the figure
+    into what the browser receives.
+    """
+    best = None
+    for _ in range(repeat):
+        with plotting_clock() as clock:
+            start = time.perf_counter()
+            fig = build_figure()
+            built = time.perf_counter() - start
+        start = time.perf_counter()
+        if hasattr(fig, 'to_json'):
+            figure_payload(fig)
+        else:
+            try:
+                figure_to_png(fig)
+            finally:
+                release(fig)
+        serialised = time.perf_counter() - start
+        timings = (built - clock.seconds, clock.seconds + serialised)
+        best = timings if best is None else (min(best[0], timings[0]), min(best[1], timings[1]))
+    return best
+
+
+def scale_frame(df, factor):
+    """Synthetic dataset with every row of ``df`` repeated ``factor`` times.
+
+    Columns, dtypes and value ranges (years, coordinates, categories) stay
+    valid for every chart; totals grow ``factor``-fold. The frame gets its own
+    ``source_hash`` so no cache mistakes it for ``df``.
+    """
+    scaled = df.iloc[np.tile(np.arange(len(df)), factor)].reset_index(drop=True)
+    scaled.attrs = dict(df.attrs)
+    scaled.attrs['source_hash'] = f"{df.attrs.get('source_hash', 'synthetic')}-x{factor}"
+    return scaled
+
+
+def regressions(results, baseline, tolerance=DEFAULT_TOLERANCE, floor=DEFAULT_FLOOR):
+    """Phases of ``results`` slower than in ``baseline``; both map case -> phase -> seconds."""
+    slower = []
+    for case, phases in results.items():
+        for phase, seconds in phases.items():
+            before = baseline.get(case, {}).get(phase)
+            if before is None or seconds is None:
+                continue
+            if seconds > before * tolerance and seconds - before > floor:
+                slower.append((case, phase, before, seconds))
+    return slower
+
+
+def run_suite(description, run, argv=None, add_arguments=None):
+    """Command line driver: run a suite, write its timings as JSON and compare them with a baseline.
+
+    ``run(args)`` returns ``{case: {phase: seconds}}``. Exits with status 1
+    when a phase regressed past the tolerance of the ``--baseline`` file.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--output', help="write the timings to this JSON file")
+    parser.add_argument('--baseline', help="JSON file of earlier timings to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="slowdown factor counted as a regression (default: %(default)s)")
+    parser.add_argument('--floor', type=float, default=DEFAULT_FLOOR,
+                        help="ignore slowdowns shorter than this many seconds (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per phase; the best is kept")
+    if add_arguments is not None:
+        add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    for case, phases in results.items():
+        timings = '  '.join(f'{phase} {seconds:7.3f}s' for phase, seconds in phases.items() if seconds is not None)
+        print(f'{case:<50} {timings}')
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results,
+        }, indent=2))
+
+    if not args.baseline:
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text())['results']
+    slower = regressions(results, baseline, args.tolerance, args.floor)
+    for case, phase, before, seconds in slower:
+        print(f'REGRESSION {case} {phase}: {before:.3f}s -> {seconds:.3f}s')
+    return 1 if slower else 0
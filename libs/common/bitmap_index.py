@@ -0,0 +1,94 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.dataset_store import frame_fingerprint
+
+
+class BitmapIndex:
+    """Packed per-value row bitmaps for the filter columns of one dataset.
+
+    A filter is answered by OR-ing the bitmaps of the selected values within a
+    column and AND-ing across columns; no column of the frame is scanned.
+    Results are cached by filter signature, so toggling back to an earlier
+    selection is a dictionary lookup.
+    """
+
+    def __init__(self, df, columns, max_cached_filters=64):
+        self.n_rows = len(df)
+        self.labels = {}
+        self.bitmaps = {}
+        rows = np.arange(self.n_rows)
+        for col in columns:
+            codes, labels = pd.factorize(df[col], sort=True)
+            bits = np.zeros((len(labels), self.n_rows), dtype=bool)
+            present = codes >= 0
+            bits[codes[present], rows[present]] = True
+            self.labels[col] = pd.Index(labels)
+            self.bitmaps[col] = np.packbits(bits, axis=1)
+        self.max_cached_filters = max_cached_filters
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(filters):
+        return tuple(sorted((col, frozenset(values)) for col, values in filters.items()))
+
+    def _column_bitmap(self, col, values):
+        positions = self.labels[col].get_indexer(list(values))
+        positions = positions[positions >= 0]
+        if len(positions) == 0:
+            return np.zeros(self.bitmaps[col].shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[col][positions], axis=0)
+
+    def mask(self, filters):
+        """Boolean row mask for ``filters`` ({column: allowed values})."""
+        signature = self._signature(filters)
+        with self._lock:
+            cached = self._results.get(signature)
+            if cached is not None:
+                self._results.move_to_end(signature)
+                return cached
+        packed = np.full((self.n_rows + 7) // 8, 0xFF, dtype=np.uint8)
+        for col, values in filters.items():
+            packed &= self._column_bitmap(col, values)
+        result = np.unpackbits(packed)[:self.n_rows].astype(bool)
+        result.flags.writeable = False
+        with self._lock:
+            self._results[signature] = result
+            while len(self._results) > self.max_cached_filters:
+                self._results.popitem(last=False)
+        return result
+
+    def rows(self, filters):
+        """Sorted row positions matching ``filters``."""
+        return np.flatnonzero(self.mask(filters))
+
+    def filter(self, df, filters):
+        """Rows of ``df`` (the indexed frame) matching ``filters``."""
+        return df[self.mask(filters)]
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+_MAX_INDEXES = 16
+
+
+def index_for(name, df, columns):
+    """Return the bitmap index of dataset ``name``, building it once per dataset version."""
+    key = (name, frame_fingerprint(df), tuple(columns))
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = BitmapIndex(df, columns)
+            _indexes[key] = index
+            while len(_indexes) > _MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
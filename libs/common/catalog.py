@@ -0,0 +1,182 @@
+import importlib
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.columnar_cache import REPO_ROOT, file_hash, read_excel_cached
+from libs.common.dataset_store import STORE
+from libs.common.hxl import read_hxl_csv
+from libs.common.instrument import timed
+from libs.common.schema import apply_schema
+
+CATALOG_PATH = Path(os.environ.get('DASHBOARD_CATALOG', Path(__file__).with_name('datasets.json')))
+DEFAULT_POLICY = {'store': True, 'warm': False, 'watch': False}
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_published = {}
+_published_lock = threading.Lock()
+
+
+def catalog():
+    """The parsed dataset catalog, read once per process."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = json.loads(CATALOG_PATH.read_text(encoding='utf-8'))
+        return _catalog
+
+
+def spec(name):
+    datasets = catalog()['datasets']
+    if name not in datasets:
+        raise KeyError(f"Unknown dataset {name!r}; the catalog defines {', '.join(sorted(datasets))}")
+    return datasets[name]
+
+
+def data_root():
+    """Directory the catalog's file paths are relative to (``DASHBOARD_DATA_DIR`` overrides it)."""
+    return Path(os.environ.get('DASHBOARD_DATA_DIR', REPO_ROOT / catalog()['root']))
+
+
+def dataset_path(name):
+    return data_root() / spec(name)['file']
+
+
+def cache_policy(name):
+    """Cache policy of a dataset: ``store`` (share through the dataset store),
+    ``warm`` (load at startup) and ``watch`` (reload when the file changes)."""
+    return {**DEFAULT_POLICY, **spec(name).get('cache', {})}
+
+
+def dataset_names(policy=None):
+    """Catalog dataset names, optionally only those with cache ``policy`` enabled."""
+    names = list(catalog()['datasets'])
+    if policy is None:
+        return names
+    return [name for name in names if cache_policy(name)[policy]]
+
+
+def resolve(reference):
+    """Import a ``package.module:function`` reference."""
+    module_name, _, attribute = reference.partition(':')
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _read_excel(path, entry):
+    return read_excel_cached(path, sheet_name=entry.get('sheet', 0))
+
+
+def _read_csv(path, entry):
+    return pd.read_csv(path, **entry.get('options', {}))
+
+
+def _read_hxl_csv(path, entry):
+    schema = entry.get('schema', {})
+    return read_hxl_csv(path, categories=schema.get('category', ()), dates=schema.get('date', ()),
+                        **entry.get('options', {}))
+
+
+READERS = {
+    'excel': _read_excel,
+    'csv': _read_csv,
+    'hxl_csv': _read_hxl_csv,
+}
+
+
+def _drop_empty_columns(df):
+    return df.dropna(axis=1, how='all').copy()
+
+
+def _drop_incomplete_columns(df):
+    return df.dropna(axis=1)
+
+
+def _dropna_rows(df, subset=None):
+    return df.dropna(subset=subset).reset_index(drop=True)
+
+
+def _month_of_year(df):
+    df['month_of_year'] = df['Month'].str[:3] + '-' + df['Year'].astype(str).str[-2:]
+    return df
+
+
+CLEANING_STEPS = {
+    'drop_empty_columns': _drop_empty_columns,
+    'drop_incomplete_columns': _drop_incomplete_columns,
+    'dropna_rows': _dropna_rows,
+    'month_of_year': _month_of_year,
+}
+
+
+def read_dataset(name):
+    """Read, clean and type a dataset as declared in the catalog, bypassing the dataset store.
+
+    ``format`` names a reader in ``READERS`` or a ``module:function`` taking the
+    path; ``clean`` lists step names (or ``{"step": name, **kwargs}``) from
+    ``CLEANING_STEPS`` or ``module:function`` references, applied in order
+    before the ``schema``.
+    """
+    entry = spec(name)
+    path = dataset_path(name)
+    reader = READERS.get(entry['format'])
+    df = reader(path, entry) if reader is not None else resolve(entry['format'])(path)
+    for step in entry.get('clean', ()):
+        kwargs = {}
+        if isinstance(step, dict):
+            kwargs = {key: value for key, value in step.items() if key != 'step'}
+            step = step['step']
+        df = (CLEANING_STEPS.get(step) or resolve(step))(df, **kwargs)
+    if 'schema' in entry:
+        df = apply_schema(df, entry['schema'])
+    df.attrs['source_hash'] = file_hash(path)
+    return df
+
+
+def build_derived(name, df):
+    """Build the caches listed under ``derived`` (``module:function`` taking the frame) for one version."""
+    for reference in spec(name).get('derived', ()):
+        resolve(reference)(df)
+
+
+def store_key(name, digest):
+    """Dataset store key of one version of a dataset."""
+    return (name, str(dataset_path(name)), digest)
+
+
+def load_version(name, digest):
+    """Return the version of dataset ``name`` whose source file hashes to ``digest``."""
+    return STORE.get(store_key(name, digest), lambda: read_dataset(name))
+
+
+def publish(versions):
+    """Atomically make ``{name: digest}`` the versions ``load`` serves; returns the previous ones."""
+    with _published_lock:
+        previous = {name: _published.get(name) for name in versions}
+        _published.update(versions)
+        return previous
+
+
+def published(name):
+    """Digest of the version of ``name`` being served, or None when no watcher publishes it."""
+    with _published_lock:
+        return _published.get(name)
+
+
+@timed(lambda name: f'load:{name}')
+def load(name):
+    """Return dataset ``name``; shared read-only through the dataset store unless its policy says otherwise.
+
+    While a watcher publishes versions (see ``libs.common.watcher``) the published
+    version is served, otherwise the version matching the file on disk.
+    """
+    if not cache_policy(name)['store']:
+        return read_dataset(name)
+    digest = published(name) or file_hash(dataset_path(name))
+    return load_version(name, digest)
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+sys.path.append('../')
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SPREADSHEETS_DIR = REPO_ROOT / 'libs' / 'misic' / 'data-points' / 'spreadsheets'
+CACHE_DIR = Path(os.environ.get('DASHBOARD_CACHE_DIR', REPO_ROOT / '.cache' / 'columnar'))
+
+_COLUMN_NAMES_KEY = b'dashboard.column_names'
+_hash_memo = {}
+
+
+def file_hash(path):
+    """Return the SHA-256 of a file, memoised on (path, size, mtime)."""
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _hash_memo.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        _hash_memo[memo_key] = digest
+    return digest
+
+
+def _slug(value):
+    return ''.join(ch if ch.isalnum() else '_' for ch in str(value)).strip('_') or 'sheet'
+
+
+def cache_path(source, sheet_name, digest=None):
+    """Location of the Arrow IPC copy of one sheet of one source file version."""
+    source = Path(source)
+    digest = digest or file_hash(source)
+    return CACHE_DIR / f"{_slug(source.stem)}-{digest[:16]}-{_slug(sheet_name)}.arrow"
+
+
+def _encode_column_names(columns):
+    """Arrow needs string column names; remember the originals (e.g. datetime headers)."""
+    encoded = []
+    for name in columns:
+        if isinstance(name, pd.Timestamp) or hasattr(name, 'isoformat'):
+            encoded.append(['datetime', pd.Timestamp(name).isoformat()])
+        elif isinstance(name, (int, float)) and not isinstance(name, bool):
+            encoded.append(['number', name])
+        else:
+            encoded.append(['str', str(name)])
+    return encoded
+
+
+def _decode_column_names(encoded):
+    decoded = []
+    for kind, value in encoded:
+        if kind == 'datetime':
+            decoded.append(pd.Timestamp(value).to_pydatetime())
+        else:
+            decoded.append(value)
+    return decoded
+
+
+def _to_arrow(df):
+    """Convert a parsed sheet to an Arrow table, stringifying mixed-type object columns."""
+    df = df.copy()
+    original_names = _encode_column_names(df.columns)
+    df.columns = [str(name) for name in df.columns]
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].map(lambda v: v if pd.isna(v) else str(v))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_COLUMN_NAMES_KEY] = json.dumps(original_names).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def _from_arrow(table):
+    df = table.to_pandas()
+    encoded = (table.schema.metadata or {}).get(_COLUMN_NAMES_KEY)
+    if encoded is not None:
+        df.columns = _decode_column_names(json.loads(encoded))
+    return df
+
+
+def _write_atomic(table, target):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    feather.write_feather(table, str(tmp), compression='uncompressed')
+    os.replace(tmp, target)
+
+
+def _sheet_names(source, digest=None):
+    """Sheet names of a workbook version, read from a manifest next to the cache."""
+    source = Path(source)
+    digest = digest or file_hash(source)
+    manifest = CACHE_DIR / f"{_slug(source.stem)}-{digest[:16]}.sheets.json"
+    if manifest.exists():
+        return json.loads(manifest.read_text())
+    names = pd.ExcelFile(source).sheet_names
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest.with_name(f"{manifest.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(names))
+    os.replace(tmp, manifest)
+    return names
+
+
+def ingest_workbook(source):
+    """Parse every sheet of a workbook once and write its columnar copies.
+
+    Returns the list of cache files for the current version of the workbook.
+    Sheets that already have a copy for this content hash are not re-parsed.
+    """
+    source = Path(source)
+    digest = file_hash(source)
+    names = _sheet_names(source, digest)
+    missing = [sheet for sheet in names if not cache_path(source, sheet, digest).exists()]
+    if missing:
+        sheets = pd.read_excel(source, sheet_name=missing)
+        for sheet, df in sheets.items():
+            _write_atomic(_to_arrow(df), cache_path(source, sheet, digest))
+    return [cache_path(source, sheet, digest) for sheet in names]
+
+
+def ingest(directory=SPREADSHEETS_DIR / 'xslx'):
+    """Build the columnar cache for every workbook under ``directory``."""
+    files = {}
+    for source in sorted(Path(directory).glob('*.xlsx')):
+        files[source.name] = ingest_workbook(source)
+    return files
+
+
+def read_arrow_cached(source, sheet_name=0):
+    """Return the memory-mapped Arrow table for a sheet, building it if the source changed."""
+    source = Path(source)
+    digest = file_hash(source)
+    if isinstance(sheet_name, int):
+        sheet_name = _sheet_names(source, digest)[sheet_name]
+    target = cache_path(source, sheet_name, digest)
+    if not target.exists():
+        df = pd.read_excel(source, sheet_name=sheet_name)
+        _write_atomic(_to_arrow(df), target)
+    return feather.read_table(str(target), memory_map=True)
+
+
+def read_excel_cached(source, sheet_name=0):
+    """Drop-in replacement for ``pd.read_excel`` backed by the columnar cache.
+
+    The workbook is only parsed with openpyxl when no Arrow copy exists for its
+    current content hash; otherwise the sheet is read from a memory-mapped
+    Arrow IPC file. The source hash is recorded in ``df.attrs['source_hash']``.
+    """
+    source = Path(source)
+    df = _from_arrow(read_arrow_cached(source, sheet_name))
+    df.attrs['source_hash'] = file_hash(source)
+    return df
+
+
+def main():
+    for name, paths in ingest().items():
+        print(f"{name}: {len(paths)} sheet(s) cached")
+
+
+if __name__ == '__main__':
+    main()
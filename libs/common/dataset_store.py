@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.columnar_cache import file_hash
+
+DEFAULT_BUDGET_BYTES = int(os.environ.get('DASHBOARD_STORE_BUDGET_MB', 512)) * 1024 * 1024
+
+
+def _freeze(df):
+    """Rebuild ``df`` from read-only column arrays so writes through any view raise.
+
+    Each column becomes its own block holding the frozen array (``copy=False``
+    skips consolidation), so in-place writes, including ``view[col] = values``
+    of the same dtype, fail instead of changing the shared data.
+    Extension arrays other than categoricals are kept as they are.
+    """
+    columns = {}
+    for name, column in df.items():
+        values = column.array
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = np.asarray(values.codes)
+            codes.flags.writeable = False
+            values = pd.Categorical.from_codes(codes, dtype=column.dtype)
+        elif isinstance(column.dtype, np.dtype):
+            values = column.to_numpy()
+            values.flags.writeable = False
+        columns[name] = values
+    frozen = pd.DataFrame(columns, index=df.index, columns=df.columns, copy=False)
+    frozen.attrs = dict(df.attrs)
+    return frozen
+
+
+class _Entry:
+    __slots__ = ('frame', 'nbytes', 'refs')
+
+    def __init__(self, frame, nbytes):
+        self.frame = frame
+        self.nbytes = nbytes
+        self.refs = 0
+
+
+class DatasetStore:
+    """Process-wide store of parsed datasets shared by every session.
+
+    Each dataset is loaded once, its arrays marked read-only, and handed out
+    as a shallow view. Views share those arrays with every other session, so
+    writing values through a view (``df.loc[...] = ``, ``df[col] = `` on an
+    existing column, ``inplace=True``) raises instead of reaching the shared
+    data (copy-on-write pandas copies first); copy the frame to modify it.
+    Views are reference counted: a dataset with live views is never evicted,
+    and unreferenced datasets are evicted least-recently-used first once the
+    resident size exceeds the memory budget.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, loader):
+        """Return a read-only view of dataset ``key``, calling ``loader()`` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._view(key, entry)
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given key; the others wait and then hit.
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return self._view(key, entry)
+            frame = _freeze(loader())
+            nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+            with self._lock:
+                self.misses += 1
+                entry = _Entry(frame, nbytes)
+                self._entries[key] = entry
+                self._loading.pop(key, None)
+                view = self._view(key, entry)
+                self._evict()
+                return view
+
+    def get_file(self, name, path, loader):
+        """Like ``get`` but keyed on the content hash of ``path``, so edits load a new version."""
+        return self.get((name, str(path), file_hash(path)), loader)
+
+    def _view(self, key, entry):
+        view = entry.frame.copy(deep=False)
+        view.attrs = dict(entry.frame.attrs)
+        entry.refs += 1
+        weakref.finalize(view, self._release, entry)
+        return view
+
+    def _release(self, entry):
+        with self._lock:
+            entry.refs -= 1
+            self._evict()
+
+    def _evict(self):
+        resident = sum(entry.nbytes for entry in self._entries.values())
+        for key in list(self._entries):
+            if resident <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refs > 0:
+                continue
+            del self._entries[key]
+            resident -= entry.nbytes
+            self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Drop one dataset (or all of them); live views keep their data."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        """Return hit/miss counters and resident size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'datasets': len(self._entries),
+                'live_views': sum(entry.refs for entry in self._entries.values()),
+                'bytes_resident': sum(entry.nbytes for entry in self._entries.values()),
+                'budget_bytes': self.budget_bytes,
+            }
+
+
+# Module-level store shared by every Streamlit session in this process
+STORE = DatasetStore()
+
+
+def frame_fingerprint(df):
+    """Identify a dataset version: the source hash when known, else a hash of the rows."""
+    source_hash = df.attrs.get('source_hash')
+    if source_hash is not None:
+        return source_hash
+    return format(int(pd.util.hash_pandas_object(df, index=True).sum()) & (2 ** 64 - 1), '016x')
@@ -0,0 +1,148 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.dataset_store import frame_fingerprint
+
+LEVELS = (256, 512, 1024, 2048, 4096)  # points kept per precomputed zoom level
+METHODS = ('lttb', 'minmax')
+
+
+def _bucket_edges(n, n_buckets):
+    """Start offsets of ``n_buckets`` near-equal buckets over ``range(1, n - 1)`` plus the end."""
+    return np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+
+
+def lttb(x, y, n_out):
+    """Indices of ``n_out`` points chosen by largest-triangle-three-buckets.
+
+    ``x`` must be sorted. The first and last points are always kept; every
+    bucket in between keeps the point spanning the largest triangle with the
+    point kept in the previous bucket and the mean of the next one.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = _bucket_edges(n, n_out - 2)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_stop = stop, edges[bucket + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        next_x, next_y = x[next_start:next_stop].mean(), y[next_start:next_stop].mean()
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+
+def minmax(x, y, n_out):
+    """Indices of the minimum and maximum of ``n_out // 2`` buckets (the envelope), in order.
+
+    Keeps every spike, so it suits noisy counts better than ``lttb``.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype='float64')
+    starts = np.r_[0, _bucket_edges(n, n_out // 2 - 1)]  # the end points are buckets of their own
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, n]))
+    kept = []
+    for extreme in (np.minimum, np.maximum):
+        candidates = np.flatnonzero(y == extreme.reduceat(y, starts)[bucket])
+        kept.append(candidates[np.unique(bucket[candidates], return_index=True)[1]])
+    return np.unique(np.concatenate(kept))
+
+
+_REDUCERS = {'lttb': lttb, 'minmax': minmax}
+
+
+class SeriesPyramid:
+    """One time series with its ``LEVELS`` downsampled copies precomputed.
+
+    ``view(width, start, end)`` returns the coarsest level that still has
+    ``width`` points (two per pixel for ``minmax``) inside the visible window,
+    so the number of points plotted depends on the chart, not on the data.
+    """
+
+    def __init__(self, x, y, method='lttb'):
+        if method not in _REDUCERS:
+            raise ValueError(f"unknown downsampling method {method!r}; expected one of {METHODS}")
+        x, y = pd.Series(x).reset_index(drop=True), pd.Series(y, dtype='float64').reset_index(drop=True)
+        keep = x.notna() & y.notna()
+        order = np.argsort(x[keep].to_numpy(), kind='stable')
+        self.x = x[keep].to_numpy()[order]
+        self.y = y[keep].to_numpy()[order]
+        self.method = method
+        self.per_pixel = 2 if method == 'minmax' else 1
+        positions = self.x.astype('datetime64[ns]').astype('int64') if self.x.dtype.kind == 'M' else self.x
+        self.levels = [(len(self.x), np.arange(len(self.x)))]
+        for n_out in sorted(LEVELS, reverse=True):
+            if n_out < len(self.x):
+                self.levels.append((n_out, _REDUCERS[method](positions, self.y, n_out)))
+
+    def __len__(self):
+        return len(self.x)
+
+    def view(self, width, start=None, end=None):
+        """Points to draw ``width`` pixels wide, limited to ``[start, end]`` when given."""
+        first = 0 if start is None else int(np.searchsorted(self.x, np.asarray(start, dtype=self.x.dtype)))
+        stop = len(self.x) if end is None else int(np.searchsorted(self.x, np.asarray(end, dtype=self.x.dtype),
+                                                                   side='right'))
+        visible = max(stop - first, 1) / max(len(self.x), 1)
+        needed = width * self.per_pixel / visible
+        index = self.levels[0][1]
+        for size, level in self.levels[1:]:
+            if size < needed:
+                break
+            index = level
+        if start is not None or end is not None:
+            # keep one point either side so the line runs to the edges of the window
+            lo = max(int(np.searchsorted(index, first)) - 1, 0)
+            hi = min(int(np.searchsorted(index, stop)) + 1, len(index))
+            index = index[lo:hi]
+        return self.x[index], self.y[index]
+
+
+def axes_width(ax):
+    """Width of ``ax`` in pixels."""
+    fig = ax.figure
+    return int(ax.get_position().width * fig.get_figwidth() * fig.dpi)
+
+
+_pyramids = OrderedDict()
+_pyramids_lock = threading.Lock()
+_MAX_PYRAMIDS = 32
+
+
+def pyramid_for(df, x_column, y_column, method='lttb'):
+    """Return the zoom levels of one column of a dataset version, building them once."""
+    key = (frame_fingerprint(df), x_column, y_column, method)
+    with _pyramids_lock:
+        pyramid = _pyramids.get(key)
+        if pyramid is None:
+            pyramid = SeriesPyramid(df[x_column], df[y_column], method)
+            _pyramids[key] = pyramid
+            while len(_pyramids) > _MAX_PYRAMIDS:
+                _pyramids.popitem(last=False)
+        else:
+            _pyramids.move_to_end(key)
+        return pyramid
+
+
+def plot_downsampled(ax, df, x_column, y_column, method='lttb', **kwargs):
+    """``ax.plot`` of ``df[y_column]`` against ``df[x_column]`` reduced to the width of ``ax``."""
+    x, y = pyramid_for(df, x_column, y_column, method).view(axes_width(ax))
+    return ax.plot(x, y, **kwargs)
@@ -0,0 +1,56 @@
+import sys
+import weakref
+from contextlib import contextmanager
+
+from matplotlib.figure import Figure
+
+sys.path.append('../')
+
+# Every figure created through new_figure() that has not been garbage collected yet
+_live_figures = weakref.WeakSet()
+
+
+def new_figure(nrows=1, ncols=1, figsize=None, dpi=100, **subplot_kw):
+    """Drop-in for ``plt.subplots`` that builds a ``Figure`` without pyplot's global registry.
+
+    Nothing keeps a reference to the returned figure, so it is freed as soon as
+    the caller drops it (``release`` additionally clears it straight away).
+    """
+    fig = Figure(figsize=figsize, dpi=dpi)
+    axes = fig.subplots(nrows, ncols, **subplot_kw)
+    _live_figures.add(fig)
+    return fig, axes
+
+
+def release(fig):
+    """Drop a figure's artists and stop tracking it."""
+    fig.clear()
+    _live_figures.discard(fig)
+
+
+@contextmanager
+def figure(nrows=1, ncols=1, figsize=None, dpi=100, **subplot_kw):
+    """Context manager around ``new_figure`` that releases the figure on exit."""
+    fig, axes = new_figure(nrows, ncols, figsize=figsize, dpi=dpi, **subplot_kw)
+    try:
+        yield fig, axes
+    finally:
+        release(fig)
+
+
+def rotate_xticks(ax, rotation, ha=None):
+    """Object-oriented equivalent of ``plt.xticks(rotation=..., ha=...)``."""
+    ax.tick_params(axis='x', labelrotation=rotation)
+    if ha is not None:
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment(ha)
+
+
+def figure_stats():
+    """Number of live figures and an estimate of their raster buffer memory."""
+    figures = list(_live_figures)
+    approx_bytes = 0
+    for fig in figures:
+        width, height = fig.get_size_inches() * fig.dpi
+        approx_bytes += int(width) * int(height) * 4
+    return {'live_figures': len(figures), 'approx_bytes': approx_bytes}
@@ -0,0 +1,65 @@
+import csv
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+
+def is_hxl_row(values):
+    """True when every non-empty cell of a row is an HXL hashtag (``#adm1+name``)."""
+    cells = [value.strip() for value in values if value and value.strip()]
+    return bool(cells) and all(cell.startswith('#') for cell in cells)
+
+
+def hxl_tags(source, encoding='utf-8'):
+    """Return ``{column: hashtag}`` of a CSV whose second row is an HXL tag row, else ``{}``."""
+    with open(source, newline='', encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        tags = next(reader, [])
+    if not is_hxl_row(tags):
+        return {}
+    return {column: tag.strip() for column, tag in zip(header, tags) if tag.strip()}
+
+
+def downcast_numeric(df, exclude=()):
+    """Shrink integer columns to the smallest int type and float columns to float32, in place.
+
+    Float columns that hold only whole numbers (integer counts with gaps) become
+    float32 as well; columns in ``exclude`` are left untouched.
+    """
+    for col in df.columns:
+        if col in exclude:
+            continue
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype):
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+        elif pd.api.types.is_float_dtype(dtype) and dtype != np.float32:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def read_hxl_csv(source, categories=(), dates=(), exclude=(), encoding='utf-8', **kwargs):
+    """Read an HDX/HXL CSV in one parse with compact dtypes.
+
+    The HXL tag row is detected from the first two lines, skipped, and kept as
+    ``df.attrs['hxl']``. ``categories`` are parsed straight to ``category``,
+    ``dates`` to ``datetime64``, and the remaining numeric columns are downcast
+    (see ``downcast_numeric``; ``exclude`` keeps full precision).
+    """
+    tags = hxl_tags(source, encoding)
+    df = pd.read_csv(
+        source,
+        skiprows=[1] if tags else None,
+        dtype={col: 'category' for col in categories},
+        parse_dates=list(dates),
+        encoding=encoding,
+        **kwargs,
+    )
+    downcast_numeric(df, exclude)
+    df.attrs['hxl'] = tags
+    return df
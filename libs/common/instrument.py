@@ -0,0 +1,157 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+MAX_SAMPLES = int(os.environ.get('DASHBOARD_INSTRUMENT_SAMPLES', 1000))  # per instrumented name
+QUANTILES = (0.5, 0.9, 0.99)
+
+_enabled = os.environ.get('DASHBOARD_INSTRUMENT', '0') not in ('', '0', 'false')
+_samples = OrderedDict()
+_samples_lock = threading.Lock()
+_active = threading.local()
+
+
+def enabled():
+    return _enabled
+
+
+def set_enabled(value):
+    """Turn recording on or off for the whole process."""
+    global _enabled
+    _enabled = bool(value)
+
+
+def _rows(args, result):
+    """Rows a call worked on: a returned frame, else the instance's (filtered) frame."""
+    if isinstance(result, pd.DataFrame):
+        return len(result)
+    owner = args[0] if args else None
+    for attribute in ('filtered_df', 'df', 'clean_data'):
+        frame = getattr(owner, attribute, None)
+        if isinstance(frame, pd.DataFrame):
+            return len(frame)
+    return None
+
+
+def add_bytes(nbytes):
+    """Count ``nbytes`` sent to the browser against every call in progress on this thread."""
+    for record in getattr(_active, 'stack', ()):
+        record['bytes'] += nbytes
+
+
+def _record(name, record):
+    with _samples_lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=MAX_SAMPLES)
+        samples.append(record)
+
+
+def timed(name):
+    """Decorator recording wall time, CPU time, rows processed and bytes rendered per call.
+
+    ``name`` may be a function of the call's arguments. When recording is off
+    the wrapper only checks a flag before calling through.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            stack = getattr(_active, 'stack', None)
+            if stack is None:
+                stack = _active.stack = []
+            label = name if isinstance(name, str) else name(*args, **kwargs)
+            record = {'name': label, 'time': time.time(), 'bytes': 0}
+            stack.append(record)
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                record['wall'] = time.perf_counter() - wall
+                record['cpu'] = time.thread_time() - cpu
+                stack.pop()
+            record['rows'] = _rows(args, result)
+            _record(label, record)
+            return result
+        return wrapper
+    return decorate
+
+
+def instrument_methods(prefixes=('plot_', 'display_')):
+    """Class decorator applying ``timed('<Class>.<method>')`` to every method starting with ``prefixes``."""
+    def decorate(cls):
+        for attribute, value in list(vars(cls).items()):
+            if callable(value) and attribute.startswith(prefixes):
+                setattr(cls, attribute, timed(f'{cls.__name__}.{attribute}')(value))
+        return cls
+    return decorate
+
+
+def records():
+    """Every retained call record, oldest first per name."""
+    with _samples_lock:
+        return [dict(record) for samples in _samples.values() for record in samples]
+
+
+def reset():
+    with _samples_lock:
+        _samples.clear()
+
+
+def summary():
+    """Per-name call count and wall/CPU percentiles, mean rows and bytes, slowest p90 first."""
+    with _samples_lock:
+        snapshot = {name: list(samples) for name, samples in _samples.items()}
+    rows = []
+    for name, samples in snapshot.items():
+        wall = np.array([sample['wall'] for sample in samples])
+        cpu = np.array([sample['cpu'] for sample in samples])
+        counted_rows = [sample['rows'] for sample in samples if sample['rows'] is not None]
+        row = {'name': name, 'calls': len(samples)}
+        for q in QUANTILES:
+            row[f'wall_p{q * 100:g}'] = float(np.quantile(wall, q))
+        row['cpu_p50'] = float(np.quantile(cpu, 0.5))
+        row['rows_mean'] = float(np.mean(counted_rows)) if counted_rows else None
+        row['bytes_mean'] = float(np.mean([sample['bytes'] for sample in samples]))
+        rows.append(row)
+    return pd.DataFrame(rows, columns=['name', 'calls'] + [f'wall_p{q * 100:g}' for q in QUANTILES]
+                        + ['cpu_p50', 'rows_mean', 'bytes_mean']).sort_values('wall_p90', ascending=False)
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text():
+    """Prometheus exposition format: wall time summaries plus CPU, row and byte counters."""
+    with _samples_lock:
+        snapshot = {name: list(samples) for name, samples in _samples.items()}
+    lines = ['# TYPE dashboard_call_wall_seconds summary']
+    for name, samples in snapshot.items():
+        wall = np.array([sample['wall'] for sample in samples])
+        label = _label(name)
+        for q in QUANTILES:
+            lines.append(f'dashboard_call_wall_seconds{{name="{label}",quantile="{q:g}"}} {np.quantile(wall, q):.6f}')
+        lines.append(f'dashboard_call_wall_seconds_sum{{name="{label}"}} {wall.sum():.6f}')
+        lines.append(f'dashboard_call_wall_seconds_count{{name="{label}"}} {len(wall)}')
+    for metric, field in (('cpu_seconds', 'cpu'), ('rows', 'rows'), ('bytes_rendered', 'bytes')):
+        lines.append(f'# TYPE dashboard_call_{metric}_total counter')
+        for name, samples in snapshot.items():
+            total = sum(sample[field] or 0 for sample in samples)
+            lines.append(f'dashboard_call_{metric}_total{{name="{_label(name)}"}} {total:g}')
+    return '\n'.join(lines) + '\n'
+
+
+def json_lines():
+    """One JSON object per retained call."""
+    return ''.join(json.dumps(record) + '\n' for record in records())
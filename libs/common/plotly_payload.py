@@ -0,0 +1,107 @@
+import base64
+import json
+import sys
+
+import numpy as np
+import plotly
+from plotly.utils import PlotlyJSONEncoder
+
+sys.path.append('../')
+
+# Trace attributes that hold one value per mark
+ARRAY_ATTRIBUTES = (('x',), ('y',), ('z',), ('customdata',), ('marker', 'size'), ('marker', 'color'))
+_INTEGER_TYPES = (np.int8, np.int16, np.int32)
+_TYPED_ARRAY_CODES = {np.int8: 'i1', np.int16: 'i2', np.int32: 'i4', np.float32: 'f4', np.float64: 'f8'}
+# Plotly 6 (and the plotly.js it ships) reads base64 typed arrays; the pinned
+# Plotly 5 does not, so there the arrays stay plain JSON lists
+TYPED_ARRAYS = int(plotly.__version__.split('.')[0]) >= 6
+
+
+def _narrow(values):
+    """``values`` in the smallest numeric dtype that holds them exactly, or ``None`` when not numeric."""
+    array = np.asarray(values)
+    if array.dtype.kind not in 'iuf' or array.size == 0:
+        return None
+    if array.dtype.kind == 'f':
+        if not np.isfinite(array).all() or not np.array_equal(array, np.round(array)):
+            narrowed = array.astype(np.float32)
+            return narrowed if np.array_equal(narrowed, array, equal_nan=True) else array.astype(np.float64)
+    low, high = array.min(), array.max()
+    for dtype in _INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array.astype(np.float64)
+
+
+def typed_array(values):
+    """Plotly typed-array form ``{'dtype', 'bdata'[, 'shape']}`` of a numeric array, or ``None`` when not numeric.
+
+    The values are stored little-endian in their narrowest exact dtype and
+    base64 encoded, so a count sent as ``int16`` costs under three bytes per
+    mark instead of a decimal string.
+    """
+    narrowed = _narrow(values)
+    if narrowed is None:
+        return None
+    encoded = {
+        'dtype': _TYPED_ARRAY_CODES[narrowed.dtype.type],
+        'bdata': base64.b64encode(narrowed.astype(narrowed.dtype.newbyteorder('<')).tobytes()).decode('ascii'),
+    }
+    if narrowed.ndim > 1:
+        encoded['shape'] = ', '.join(str(n) for n in narrowed.shape)
+    return encoded
+
+
+def _from_typed_array(encoded):
+    """Inverse of ``typed_array`` (Plotly 6+ already stores arrays in that form)."""
+    code = {code: dtype for dtype, code in _TYPED_ARRAY_CODES.items()}.get(encoded['dtype'], encoded['dtype'])
+    array = np.frombuffer(base64.b64decode(encoded['bdata']), dtype=np.dtype(code).newbyteorder('<'))
+    if 'shape' in encoded:
+        array = array.reshape([int(n) for n in str(encoded['shape']).split(',')])
+    return array
+
+
+def _encode_trace(trace, typed):
+    for path in ARRAY_ATTRIBUTES:
+        owner = trace
+        for name in path[:-1]:
+            owner = owner.get(name) if isinstance(owner, dict) else None
+        if not isinstance(owner, dict):
+            continue
+        values = owner.get(path[-1])
+        if isinstance(values, dict) and 'bdata' in values:
+            values = _from_typed_array(values)
+        if not isinstance(values, (list, tuple, np.ndarray)):
+            continue
+        if typed:
+            encoded = typed_array(values)
+        else:
+            # whole numbers are written without a trailing '.0'
+            narrowed = _narrow(values)
+            encoded = None if narrowed is None else narrowed.tolist()
+        if encoded is not None:
+            owner[path[-1]] = encoded
+
+
+def marks(fig):
+    """Number of marks (points, bars, cells) the figure draws."""
+    total = 0
+    for trace in fig.data:
+        for name in ('z', 'y', 'x'):
+            values = getattr(trace, name, None)
+            if values is not None and not isinstance(values, (str, int, float)):
+                total += int(np.size(values))
+                break
+    return total
+
+
+def figure_payload(fig, typed=TYPED_ARRAYS):
+    """The figure as sent to the browser: JSON bytes with every per-mark numeric array in its narrowest exact dtype.
+
+    With ``typed`` (Plotly 6+) the arrays are base64 typed arrays, otherwise plain lists.
+    """
+    spec = fig.to_plotly_json()
+    for trace in spec['data']:
+        _encode_trace(trace, typed)
+    return json.dumps(spec, cls=PlotlyJSONEncoder).encode()
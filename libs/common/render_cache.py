@@ -0,0 +1,146 @@
+import io
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+import streamlit as st
+
+sys.path.append('../')
+
+from libs.common.figures import release
+from libs.common.instrument import add_bytes
+from libs.common.plotly_payload import figure_payload, marks
+
+DEFAULT_MAX_BYTES = int(os.environ.get('DASHBOARD_RENDER_CACHE_MB', 128)) * 1024 * 1024
+
+
+class RenderCache:
+    """Byte-bounded LRU of rendered charts (PNG bytes or Plotly JSON)."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_resident = 0
+        self.hits = 0
+        self.misses = 0
+        self.payloads = OrderedDict()  # chart id -> size of its last render
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key, payload):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes_resident -= len(previous)
+            self._entries[key] = payload
+            self.bytes_resident += size
+            while self.bytes_resident > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes_resident -= len(evicted)
+
+    def record_payload(self, chart_id, nbytes, n_marks):
+        """Remember the size of a chart's last rendered payload."""
+        with self._lock:
+            self.payloads[chart_id] = {'bytes': nbytes, 'marks': n_marks,
+                                       'bytes_per_mark': round(nbytes / n_marks, 1) if n_marks else None}
+            self.payloads.move_to_end(chart_id)
+
+    def payload_stats(self):
+        with self._lock:
+            return {chart_id: dict(sizes) for chart_id, sizes in self.payloads.items()}
+
+    def drop_fingerprint(self, fingerprint):
+        """Drop every chart rendered from one dataset version."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == fingerprint]:
+                self.bytes_resident -= len(self._entries.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_resident = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'charts': len(self._entries),
+                'bytes_resident': self.bytes_resident,
+                'max_bytes': self.max_bytes,
+            }
+
+
+# Module-level cache shared by every Streamlit session in this process
+RENDER_CACHE = RenderCache()
+
+
+def current_theme():
+    return st.get_option('theme.base') or 'light'
+
+
+def render_key(fingerprint, chart_id, params=None, theme=None):
+    """Cache key: dataset fingerprint, chart id, filter parameters and theme."""
+    return (fingerprint, chart_id, json.dumps(params, sort_keys=True, default=str),
+            theme or current_theme())
+
+
+def figure_to_png(fig, dpi=100):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def render_png(chart_id, fingerprint, build_figure, params=None, theme=None):
+    """Return the PNG for a Matplotlib chart, building the figure only on a cache miss."""
+    key = render_key(fingerprint, chart_id, params, theme)
+    png = RENDER_CACHE.get(key)
+    if png is None:
+        fig = build_figure()
+        try:
+            png = figure_to_png(fig)
+        finally:
+            release(fig)
+        RENDER_CACHE.put(key, png)
+    return png
+
+
+def render_plotly_json(chart_id, fingerprint, build_figure, params=None, theme=None):
+    """Return the serialized Plotly figure for a chart, building it only on a cache miss."""
+    key = render_key(fingerprint, chart_id, params, theme)
+    payload = RENDER_CACHE.get(key)
+    if payload is None:
+        fig = build_figure()
+        payload = figure_payload(fig)
+        RENDER_CACHE.record_payload(chart_id, len(payload), marks(fig))
+        RENDER_CACHE.put(key, payload)
+    return payload
+
+
+def pyplot(chart_id, fingerprint, build_figure, params=None, theme=None):
+    """Cached replacement for ``st.pyplot(build_figure())``."""
+    png = render_png(chart_id, fingerprint, build_figure, params, theme)
+    add_bytes(len(png))
+    st.image(png, use_column_width=True)
+
+
+def plotly_chart(chart_id, fingerprint, build_figure, params=None, theme=None, **kwargs):
+    """Cached replacement for ``st.plotly_chart(build_figure())``."""
+    payload = render_plotly_json(chart_id, fingerprint, build_figure, params, theme)
+    add_bytes(len(payload))
+    st.plotly_chart(pio.from_json(payload.decode()), **kwargs)
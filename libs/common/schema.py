@@ -0,0 +1,38 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+# Column types a dataset's catalog entry can declare under "schema":
+#   category - low-cardinality strings
+#   integer  - counts, stored in the smallest integer type that holds them
+#              (float64 when the column has gaps, so totals stay exact)
+#   date     - parsed to datetime64
+
+
+def smallest_integer(values):
+    """Downcast a count column to the smallest signed integer type; columns with gaps stay float64."""
+    values = pd.to_numeric(values, errors='coerce')
+    if values.isna().any():
+        return values.astype(np.float64)
+    return pd.to_numeric(values.astype(np.int64), downcast='integer')
+
+
+def apply_schema(df, schema):
+    """Convert the columns of ``df`` in place to the declared types and return it.
+
+    ``schema`` maps each type to a list of columns. Declared columns missing
+    from ``df`` (e.g. dropped as empty) are ignored.
+    """
+    for col in schema.get('date', ()):
+        if col in df and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in schema.get('category', ()):
+        if col in df:
+            df[col] = df[col].astype('category')
+    for col in schema.get('integer', ()):
+        if col in df:
+            df[col] = smallest_integer(df[col])
+    return df
@@ -0,0 +1,143 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('../')
+
+from libs.common.dataset_store import frame_fingerprint
+
+# PRIO-GRID: 0.5 degree cells numbered row-major from (-90, -180), starting at 1
+CELL_DEG = 0.5
+GRID_ROWS = 360
+GRID_COLS = 720
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def grid_row(lat):
+    return np.clip(np.floor((np.asarray(lat, dtype=float) + 90) / CELL_DEG), 0, GRID_ROWS - 1).astype(np.int64)
+
+
+def grid_col(lon):
+    return np.clip(np.floor((np.asarray(lon, dtype=float) + 180) / CELL_DEG), 0, GRID_COLS - 1).astype(np.int64)
+
+
+def grid_cell(lat, lon):
+    """PRIO-GRID cell id (``priogrid_gid``) of each point."""
+    return grid_row(lat) * GRID_COLS + grid_col(lon) + 1
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class GridIndex:
+    """Spatial index of point events keyed on their PRIO-GRID cell.
+
+    Event rows are sorted by cell id, so each grid row of a bounding box is one
+    contiguous slice found with two binary searches; only events in the
+    boundary cells are tested against exact coordinates. Per (cell, period)
+    counts and measure sums are pre-aggregated at build time, so tiles for the
+    map are rolled up from non-empty cells instead of from events.
+    """
+
+    def __init__(self, df, lat='latitude', lon='longitude', measures=('best',), period='year'):
+        self.lat = df[lat].to_numpy(dtype=float)
+        self.lon = df[lon].to_numpy(dtype=float)
+        self.measures = tuple(measures)
+        located = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lon))
+        cells = grid_cell(self.lat[located], self.lon[located])
+        periods = (df[period].to_numpy()[located].astype(np.int64) if period
+                   else np.zeros(len(located), dtype=np.int64))
+
+        order = np.lexsort((periods, cells))
+        self.keys = cells[order]  # Sorted cell id of each located event
+        self.rows = located[order]  # Matching DataFrame row positions
+
+        periods = periods[order]
+        starts = np.flatnonzero(np.r_[True, (self.keys[1:] != self.keys[:-1]) | (periods[1:] != periods[:-1])])
+        if len(order) == 0:
+            starts = starts[:0]
+        self.group_cells = self.keys[starts]
+        self.group_periods = periods[starts]
+        self.group_counts = np.diff(np.r_[starts, len(order)])
+        self.group_sums = {}
+        for measure in self.measures:
+            values = np.nan_to_num(df[measure].to_numpy(dtype=float)[self.rows])
+            self.group_sums[measure] = np.add.reduceat(values, starts) if len(starts) else values[:0]
+
+    def bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """Row positions of the events inside a bounding box."""
+        rows = np.arange(grid_row(min_lat), grid_row(max_lat) + 1)
+        col_lo, col_hi = grid_col(min_lon), grid_col(max_lon)
+        starts = np.searchsorted(self.keys, rows * GRID_COLS + col_lo + 1, 'left')
+        ends = np.searchsorted(self.keys, rows * GRID_COLS + col_hi + 1, 'right')
+        slices = [self.rows[start:end] for start, end in zip(starts, ends) if end > start]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.concatenate(slices)
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+        return np.sort(candidates[inside])
+
+    def radius(self, lat, lon, km):
+        """Row positions of the events within ``km`` of a point."""
+        dlat = km / KM_PER_DEGREE
+        dlon = km / (KM_PER_DEGREE * max(np.cos(np.radians(lat)), 1e-6))
+        candidates = self.bbox(max(lat - dlat, -90), max(lon - dlon, -180),
+                               min(lat + dlat, 90), min(lon + dlon, 180))
+        distance = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        return candidates[distance <= km]
+
+    def tiles(self, cell_deg=CELL_DEG, bbox=None, periods=None):
+        """Event counts and measure sums per ``cell_deg`` tile, rolled up from the grid cells.
+
+        ``bbox`` is ``(min_lat, min_lon, max_lat, max_lon)`` and ``periods`` an
+        inclusive ``(first, last)`` range; both select whole base cells.
+        """
+        row = (self.group_cells - 1) // GRID_COLS
+        col = (self.group_cells - 1) % GRID_COLS
+        keep = np.ones(len(self.group_cells), dtype=bool)
+        if periods is not None:
+            keep &= (self.group_periods >= periods[0]) & (self.group_periods <= periods[1])
+        if bbox is not None:
+            keep &= (row >= grid_row(bbox[0])) & (row <= grid_row(bbox[2]))
+            keep &= (col >= grid_col(bbox[1])) & (col <= grid_col(bbox[3]))
+
+        factor = max(1, int(round(cell_deg / CELL_DEG)))
+        tile_row, tile_col = row[keep] // factor, col[keep] // factor
+        tile_keys, tile = np.unique(tile_row * GRID_COLS + tile_col, return_inverse=True)
+        tile_deg = factor * CELL_DEG
+        result = pd.DataFrame({
+            'latitude': -90 + (tile_keys // GRID_COLS + 0.5) * tile_deg,
+            'longitude': -180 + (tile_keys % GRID_COLS + 0.5) * tile_deg,
+            'events': np.bincount(tile, weights=self.group_counts[keep], minlength=len(tile_keys)).astype(np.int64),
+        })
+        for measure in self.measures:
+            result[measure] = np.bincount(tile, weights=self.group_sums[measure][keep], minlength=len(tile_keys))
+        return result
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+_MAX_INDEXES = 16
+
+
+def index_for(name, df, lat='latitude', lon='longitude', measures=('best',), period='year'):
+    """Return the grid index of dataset ``name``, building it once per dataset version."""
+    key = (name, frame_fingerprint(df), lat, lon, tuple(measures), period)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = GridIndex(df, lat, lon, measures, period)
+            _indexes[key] = index
+            while len(_indexes) > _MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import duckdb
+
+sys.path.append('../')
+
+from libs.common.catalog import dataset_names, load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.instrument import timed
+
+SQL_THREADS = int(os.environ.get('DASHBOARD_SQL_THREADS', os.cpu_count() or 1))
+MAX_ROWS = int(os.environ.get('DASHBOARD_SQL_MAX_ROWS', 100000))  # rows any ad-hoc result may return
+DEFAULT_ROWS = 1000
+_MAX_RESULTS = 64
+# Only statements that read: no DDL, no writes, no SET/ATTACH/COPY
+_READ_ONLY = (duckdb.StatementType.SELECT, duckdb.StatementType.EXPLAIN)
+
+
+class QueryError(ValueError):
+    """A query was rejected before it reached the engine."""
+
+
+class SQLEngine:
+    """In-process DuckDB connection with every catalogued dataset registered as a table.
+
+    Tables are the frames ``load`` serves (zero-copy registrations, named after
+    the dataset), registered when a query first reads them, so queries always
+    see the published version; a hot swap re-registers the table on the next
+    query that reads it. File access is disabled, so SQL
+    can only read registered datasets. Results are cached per query, row limit
+    and dataset versions.
+    """
+
+    def __init__(self, threads=SQL_THREADS):
+        self._connection = duckdb.connect(config={'threads': threads, 'enable_external_access': False})
+        self._lock = threading.Lock()
+        self._registered = {}
+        self.errors = {}
+        self._results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _register_tables(self, names):
+        """(Re-)register the datasets ``names`` whose published version changed; returns their versions."""
+        versions = []
+        for name in names:
+            try:
+                df = load(name)
+            except Exception as e:
+                self.errors[name] = f'{type(e).__name__}: {e}'
+                continue
+            self.errors.pop(name, None)
+            fingerprint = frame_fingerprint(df)
+            if self._registered.get(name) != fingerprint:
+                self._connection.register(name, df)
+                self._registered[name] = fingerprint
+            versions.append((name, fingerprint))
+        return tuple(versions)
+
+    def _tables_of(self, sql):
+        """Catalog datasets a query reads (every dataset when the query cannot be parsed)."""
+        names = dataset_names()
+        try:
+            referenced = self._connection.get_table_names(sql)
+        except duckdb.Error:
+            return names
+        return [name for name in names if name in referenced]
+
+    def tables(self):
+        """Column names and types of every dataset, registering them all."""
+        with self._lock:
+            self._register_tables(dataset_names())
+            return {name: self._connection.sql(f'DESCRIBE "{name}"').df()[['column_name', 'column_type']]
+                    for name in self._registered}
+
+    @staticmethod
+    def check(sql):
+        """Reject anything but a single read-only statement."""
+        try:
+            statements = duckdb.extract_statements(sql)
+        except duckdb.Error as e:
+            raise QueryError(str(e)) from e
+        if len(statements) != 1:
+            raise QueryError("Enter exactly one SQL statement.")
+        if statements[0].type not in _READ_ONLY:
+            raise QueryError("Only SELECT (or EXPLAIN) statements can be run.")
+
+    @timed('sql:execute')
+    def execute(self, sql, params=None, limit=None):
+        """Run a read-only query; returns the frame, whether rows were cut at ``limit``, seconds and cache use."""
+        self.check(sql)
+        limit = MAX_ROWS if limit is None else min(int(limit), MAX_ROWS)
+        with self._lock:
+            versions = self._register_tables(self._tables_of(sql))
+            key = (sql.strip(), json.dumps(params, sort_keys=True, default=str), limit, versions)
+            result = self._results.get(key)
+            if result is not None:
+                self.hits += 1
+                self._results.move_to_end(key)
+                return {**result, 'cached': True}
+            self.misses += 1
+            start = time.perf_counter()
+            frame = self._connection.sql(sql, params=params).limit(limit + 1).df()
+            result = {
+                'frame': frame.head(limit),
+                'truncated': len(frame) > limit,
+                'seconds': time.perf_counter() - start,
+            }
+            self._results[key] = result
+            while len(self._results) > _MAX_RESULTS:
+                self._results.popitem(last=False)
+        return {**result, 'cached': False}
+
+    def query(self, sql, params=None):
+        """The frame of a read-only query (at most ``MAX_ROWS`` rows), for dashboard aggregations."""
+        return self.execute(sql, params)['frame'].copy()
+
+    def stats(self):
+        with self._lock:
+            return {'tables': len(self._registered), 'results': len(self._results),
+                    'hits': self.hits, 'misses': self.misses, 'threads': SQL_THREADS}
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def engine():
+    """The process-wide SQL engine, connected on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = SQLEngine()
+        return _engine
+
+
+def query(sql, params=None):
+    return engine().query(sql, params)
@@ -0,0 +1,120 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+sys.path.append('../')
+
+from libs.common.catalog import build_derived, dataset_names, dataset_path, load, spec
+from libs.common.columnar_cache import ingest_workbook
+
+WARMUP_WORKERS = int(os.environ.get('DASHBOARD_WARMUP_WORKERS', 4))
+
+_status = OrderedDict()
+_status_lock = threading.Lock()
+_started = None
+_started_lock = threading.Lock()
+
+
+def _set_status(name, **fields):
+    with _status_lock:
+        _status.setdefault(name, {'state': 'pending', 'seconds': None, 'rows': None, 'error': None})
+        _status[name].update(fields)
+
+
+def readiness():
+    """Per-dataset warm-up state (pending, loading, ready or failed), load time and row count."""
+    with _status_lock:
+        return OrderedDict((name, dict(status)) for name, status in _status.items())
+
+
+def is_ready():
+    """True once every warmed dataset has finished loading, successfully or not."""
+    states = [status['state'] for status in readiness().values()]
+    return bool(states) and all(state in ('ready', 'failed') for state in states)
+
+
+def warm_dataset(name):
+    """Load one dataset into the dataset store and build its ``derived`` caches.
+
+    A catalog entry may list ``derived`` ``module:function`` references; each is
+    called with the loaded frame and builds the per-version structures a page
+    needs (aggregate cubes, indexes), so the first visitor finds them ready.
+    """
+    _set_status(name, state='loading')
+    start = time.perf_counter()
+    try:
+        df = load(name)
+        build_derived(name, df)
+    except Exception as exc:  # one broken file must not keep the others cold
+        _set_status(name, state='failed', seconds=time.perf_counter() - start, error=repr(exc))
+        return None
+    _set_status(name, state='ready', seconds=time.perf_counter() - start, rows=len(df))
+    return df
+
+
+def prebuild_columnar(names=None, processes=None):
+    """Parse the workbooks behind ``names`` into the columnar cache, one process per workbook.
+
+    Parsing xlsx is CPU bound, so this uses a process pool; the Arrow copies it
+    writes are then read by every process through ``read_excel_cached``.
+    """
+    names = dataset_names('warm') if names is None else names
+    workbooks = sorted({dataset_path(name) for name in names if spec(name)['format'] == 'excel'})
+    if not workbooks:
+        return []
+    with ProcessPoolExecutor(processes or min(len(workbooks), os.cpu_count() or 1)) as pool:
+        return list(pool.map(ingest_workbook, workbooks))
+
+
+def warm_up(names=None, workers=WARMUP_WORKERS):
+    """Load every dataset whose cache policy has ``warm`` set, in a thread pool.
+
+    Threads share this process's dataset store, so loaded frames serve every
+    later session; a page requesting a dataset that is still loading waits
+    for that load instead of starting its own. Returns ``readiness()``.
+    """
+    names = dataset_names('warm') if names is None else names
+    for name in names:
+        _set_status(name)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='warmup') as pool:
+        list(pool.map(warm_dataset, names))
+    return readiness()
+
+
+def start_background_warmup(names=None, workers=WARMUP_WORKERS):
+    """Start ``warm_up`` on a daemon thread once per process and return that thread."""
+    global _started
+    with _started_lock:
+        if _started is None:
+            _started = threading.Thread(target=warm_up, args=(names, workers), name='warmup', daemon=True)
+            _started.start()
+        return _started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the dataset caches ahead of serving the dashboard.")
+    parser.add_argument('datasets', nargs='*', help="Dataset names (default: every dataset with warm set)")
+    parser.add_argument('--workers', type=int, default=WARMUP_WORKERS, help="Threads loading datasets")
+    parser.add_argument('--processes', type=int, default=None, help="Processes parsing workbooks")
+    args = parser.parse_args(argv)
+
+    names = args.datasets or None
+    start = time.perf_counter()
+    prebuild_columnar(names, args.processes)
+    print(f"columnar cache: {time.perf_counter() - start:.2f}s")
+    failed = False
+    for name, status in warm_up(names, args.workers).items():
+        if status['state'] == 'ready':
+            print(f"{name}: ready in {status['seconds']:.2f}s ({status['rows']} rows)")
+        else:
+            failed = True
+            print(f"{name}: {status['state']} after {status['seconds']:.2f}s: {status['error']}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
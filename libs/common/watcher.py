@@ -0,0 +1,134 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+sys.path.append('../')
+
+from libs.common.catalog import (build_derived, dataset_names, dataset_path, load_version, publish,
+                                 published, store_key)
+from libs.common.columnar_cache import file_hash
+from libs.common.dataset_store import STORE
+from libs.common.render_cache import RENDER_CACHE
+
+WATCH_INTERVAL = float(os.environ.get('DASHBOARD_WATCH_INTERVAL', 2.0))
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DatasetWatcher:
+    """Polls the source files of watched datasets and hot-swaps new versions in.
+
+    A file counts as changed when its size or mtime moves and, once it has
+    stopped changing for one interval, its content hash differs from the
+    served version. The new version of every dataset read from that file is
+    parsed and its derived caches are built on this thread while sessions
+    keep getting the old one; then all of them are published in one step.
+    A single thread does all reloads, so edits never cause a stampede.
+    A file that fails to reload (deleted or half-written mid-poll, a reader
+    error) is reported in ``errors`` and on stderr, and polling goes on.
+    """
+
+    def __init__(self, names=None, interval=WATCH_INTERVAL):
+        self.interval = interval
+        self.files = OrderedDict()
+        for name in dataset_names('watch') if names is None else names:
+            self.files.setdefault(str(dataset_path(name)), []).append(name)
+        self._seen = {}
+        self._pending = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.swaps = 0
+        self.errors = {}
+
+    def publish_current(self):
+        """Serve the versions currently on disk and remember their file stats."""
+        for path, names in self.files.items():
+            self._seen[path] = _stat(path)
+            if self._seen[path] is not None:
+                digest = file_hash(path)
+                publish({name: digest for name in names if published(name) is None})
+
+    def check(self):
+        """Run one poll; returns the names of the datasets swapped in."""
+        swapped = []
+        for path, names in self.files.items():
+            try:
+                if self._check_file(path, names):
+                    swapped.extend(names)
+            except Exception as exc:  # one bad file must not stop the others (or the thread)
+                self._failed(names, exc)
+        return swapped
+
+    def _check_file(self, path, names):
+        stat = _stat(path)
+        if stat is None or stat == self._seen.get(path):
+            return False
+        if stat != self._pending.get(path):  # still changing; look again next poll
+            self._pending[path] = stat
+            return False
+        self._seen[path] = stat  # a failed reload is retried when the file changes again
+        digest = file_hash(path)
+        return any(published(name) != digest for name in names) and self._swap(names, digest)
+
+    def _failed(self, names, exc):
+        for name in names:
+            self.errors[name] = repr(exc)
+        print(f"dataset watcher: reloading {', '.join(names)} failed: {exc!r}", file=sys.stderr)
+
+    def _swap(self, names, digest):
+        versions = {}
+        try:
+            for name in names:
+                df = load_version(name, digest)
+                if df.attrs.get('source_hash') != digest:  # the file moved on while it was read
+                    STORE.invalidate(store_key(name, digest))
+                    return False
+                build_derived(name, df)
+                versions[name] = digest
+        except Exception as exc:  # keep serving the previous version
+            self._failed(names, exc)
+            return False
+        previous = publish(versions)
+        for name, old in previous.items():
+            self.errors.pop(name, None)
+            if old is not None and old != digest:
+                STORE.invalidate(store_key(name, old))  # live views keep their data
+                RENDER_CACHE.drop_fingerprint(old)
+        self.swaps += 1
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        if self._thread is None:
+            self.publish_current()
+            self._thread = threading.Thread(target=self._run, name='dataset-watcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def start_watcher(interval=WATCH_INTERVAL):
+    """Start the dataset watcher once per process and return it."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = DatasetWatcher(interval=interval).start()
+        return _watcher
@@ -1,22 +1,29 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import sys
 sys.path.append('../')
 
+from libs.common.catalog import load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.figures import new_figure
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import plotly_chart, pyplot
+from libs.common.sql import query
+
+@instrument_methods()
 class DisplacementDashboard:
-    def __init__(self, data_path):
-        self.data_path = data_path
+    def __init__(self):
         self.idps_since_2009 = None
         self.idps_by_year = None
+        self.fingerprint = None
         self.load_data()
 
     def load_data(self):
-        """Load the data from Excel files."""
-        self.idps_since_2009 = pd.read_excel(self.data_path, sheet_name='IDPs in WestBank since 2009')
-        self.idps_by_year = pd.read_excel(self.data_path, sheet_name='IDPs in WestBank by Year')
+        """Load both sheets as shared read-only views from the dataset catalog."""
+        self.idps_since_2009 = load('displacement_since_2009')
+        self.idps_by_year = load('displacement_by_year')
+        self.fingerprint = frame_fingerprint(self.idps_by_year)
 
     def calculate_totals(self):
         """Calculate total statistics."""
@@ -40,27 +47,40 @@ class DisplacementDashboard:
     def plot_idps_by_governorate(self):
         """Plot total IDPs by Governorate."""
         st.subheader("Total Internally Displaced Persons (IDPs) by Governorate (2009-present)")
-        fig, ax = plt.subplots(figsize=(14, 6))
+        pyplot('displacement.idps_by_governorate', self.fingerprint, self.idps_by_governorate_figure)
+
+    def idps_by_governorate_figure(self):
+        """Build the IDPs by governorate bar chart."""
+        fig, ax = new_figure(figsize=(14, 6))
         sns.barplot(data=self.idps_since_2009, x='Governorate', y='IDPs', palette='viridis', ax=ax)
         ax.set_title('Total Internally Displaced Persons (2009-present)')
         ax.set_xticklabels(ax.get_xticklabels(), rotation=45)
         ax.set_ylabel('IDPs')
-        st.pyplot(fig)
+        return fig
 
     def plot_idps_over_time(self):
         """Plot the number of IDPs over time by governorate."""
         st.subheader("Number of IDPs over Time (Yearly)")
+        plotly_chart('displacement.idps_over_time', self.fingerprint, self.idps_over_time_figure)
+
+    def idps_over_time_figure(self):
+        """Build the yearly IDPs line chart."""
         fig = px.line(self.idps_by_year, x='Year', y='IDPs', color='Governorate',
                       title='Number of IDPs over Time (Yearly)',
                       labels={'IDPs': 'Number of Internally Displaced Persons', 'Year': 'Year'},
                       markers=True)
         fig.update_layout(hovermode="x unified", template="plotly_white")
-        st.plotly_chart(fig)
+        return fig
 
     def plot_demolished_structures_and_affected_people(self):
         """Plot demolished structures and affected people by governorate."""
         st.subheader("Demolished Structures and Affected People by Governorate (2009-present)")
-        fig, axs = plt.subplots(1, 2, figsize=(15, 7))
+        pyplot('displacement.structures_and_affected', self.fingerprint,
+               self.demolished_structures_and_affected_people_figure)
+
+    def demolished_structures_and_affected_people_figure(self):
+        """Build the demolished structures / affected people bar charts."""
+        fig, axs = new_figure(1, 2, figsize=(15, 7))
         axs[0].bar(self.idps_since_2009['Governorate'], self.idps_since_2009['Demolished Structures'], color='gray')
         axs[0].set_title('Demolished Structures')
         axs[0].set_ylabel('Number of Structures')
@@ -71,49 +91,85 @@ class DisplacementDashboard:
         axs[1].set_ylabel('Number of People')
         axs[1].set_xticklabels(self.idps_since_2009['Governorate'], rotation=45, ha='right')
 
-        plt.tight_layout()
-        st.pyplot(fig)
+        fig.tight_layout()
+        return fig
 
     def plot_histograms(self):
         """Plot various histograms."""
         st.subheader("Distribution of Demolished Structures by Governorate")
-        fig = px.histogram(self.idps_by_year, x='Governorate', y='Demolished Structures', 
-                           nbins=len(self.idps_by_year['Governorate'].unique()), 
-                           title='Distribution of Demolished Structures by Governorate',
-                           labels={'Demolished Structures': 'Number of Demolished Structures', 'Governorate': 'Governorate'},
-                           color='Year', barmode='group')
-        fig.update_layout(template="plotly_white", bargap=0.2)
-        st.plotly_chart(fig)
+        plotly_chart('displacement.structures_by_governorate', self.fingerprint,
+                     self.structures_by_governorate_figure)
 
         st.subheader("Distribution of Demolished Structures by Year")
-        fig = px.histogram(self.idps_by_year, x='Year', y='Demolished Structures',
-                           nbins=len(self.idps_by_year['Year'].unique()),
-                           title='Distribution of Demolished Structures by Year',
-                           labels={'Demolished Structures': 'Number of Demolished Structures', 'Year': 'Year'},
-                           color='Governorate', barmode='stack')
+        plotly_chart('displacement.structures_by_year', self.fingerprint, self.structures_by_year_figure)
+
+    def yearly_totals(self):
+        """Demolished structures and affected people summed per governorate and year."""
+        return query("""
+            SELECT CAST("Governorate" AS VARCHAR) AS "Governorate", "Year",
+                   CAST(SUM("Demolished Structures") AS BIGINT) AS "Demolished Structures",
+                   CAST(SUM("Affected people") AS BIGINT) AS "Affected people"
+            FROM displacement_by_year
+            GROUP BY ALL
+            ORDER BY "Governorate", "Year"
+        """)
+
+    def structures_by_governorate_figure(self):
+        """Build the demolished structures by governorate histogram from pre-binned totals."""
+        totals = self.yearly_totals()
+        totals['Year'] = totals['Year'].astype(str)
+        fig = px.bar(totals, x='Governorate', y='Demolished Structures',
+                     title='Distribution of Demolished Structures by Governorate',
+                     labels={'Demolished Structures': 'Number of Demolished Structures', 'Governorate': 'Governorate'},
+                     color='Year', barmode='group')
+        fig.update_layout(template="plotly_white", bargap=0.2)
+        return fig
+
+    def structures_by_year_figure(self):
+        """Build the demolished structures by year histogram from pre-binned totals."""
+        fig = px.bar(self.yearly_totals(), x='Year', y='Demolished Structures',
+                     title='Distribution of Demolished Structures by Year',
+                     labels={'Demolished Structures': 'Number of Demolished Structures', 'Year': 'Year'},
+                     color='Governorate', barmode='stack')
         fig.update_layout(template="plotly_white", bargap=0.05, bargroupgap=0.1,
                           title={'text': "Distribution of Demolished Structures by Year",
                                  'y': 0.9, 'x': 0.5, 'xanchor': 'center', 'yanchor': 'top'})
         fig.update_xaxes(tickmode='linear', tick0=1, dtick=1)
-        st.plotly_chart(fig)
+        return fig
 
     def plot_bubble_chart(self):
         """Plot bubble chart for affected people over time."""
         st.subheader("Affected People Over Time by Governorate")
-        fig = px.scatter(self.idps_by_year, x='Year', y='Governorate', size='Affected people', color='Governorate',
+        plotly_chart('displacement.affected_bubble', self.fingerprint, self.bubble_chart_figure)
+
+    def bubble_chart_figure(self):
+        """Build the affected people bubble chart: one bubble per governorate and year."""
+        fig = px.scatter(self.yearly_totals(), x='Year', y='Governorate', size='Affected people', color='Governorate',
                          title='Affected People Over Time by Governorate', size_max=60)
         fig.update_layout(template="plotly_white")
-        st.plotly_chart(fig)
+        return fig
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('displacement.idps_by_governorate', 'Total IDPs by Governorate (2009-present)', 'idps_by_governorate_figure'),
+    ('displacement.idps_over_time', 'Number of IDPs over Time (Yearly)', 'idps_over_time_figure'),
+    ('displacement.structures_and_affected', 'Demolished Structures and Affected People by Governorate', 'demolished_structures_and_affected_people_figure'),
+    ('displacement.structures_by_governorate', 'Distribution of Demolished Structures by Governorate', 'structures_by_governorate_figure'),
+    ('displacement.structures_by_year', 'Distribution of Demolished Structures by Year', 'structures_by_year_figure'),
+    ('displacement.affected_bubble', 'Affected People Over Time by Governorate', 'bubble_chart_figure'),
+]
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(DisplacementDashboard(), builder)()
 
 def main():
     # Streamlit title
     st.title("Displacement Due to Demolitions in West Bank")
     
-    # Path to data
-    data_path = r'/home/marktine/data Vis/Isreal_x_Hamas-BI-/libs/misic/data-points/spreadsheets/xslx/West Bank - Displacement due to Demolitions.xlsx'
-    
     # Create the dashboard
-    dashboard = DisplacementDashboard(data_path)
+    dashboard = DisplacementDashboard()
 
     # Calculate totals and display metrics
     totals = dashboard.calculate_totals()
@@ -0,0 +1,137 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import sys
+sys.path.append('../')
+
+from libs.common.catalog import dataset_path, load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import plotly_chart
+from libs.gaza_idp.timeseries_store import TOTAL_LOCATION, store_for
+
+
+def read_idps(source):
+    """Catalog reader: sync the time-series store with the workbook and return every stored row."""
+    store = store_for(source)
+    store.sync(source)
+    return store.frame()
+
+
+def load_idps():
+    """Return the IDP time series from the dataset catalog."""
+    return load('gaza_idps')
+
+
+@instrument_methods()
+class GazaIDPDashboard:
+    def __init__(self):
+        self.df = load_idps()
+        self.fingerprint = frame_fingerprint(self.df)
+        self.store = store_for(dataset_path('gaza_idps'))
+        self.governorates = self.df[self.df['Governorate'] != TOTAL_LOCATION]
+        if self.governorates['Governorate'].dtype == 'category':
+            # plotly 5 groups by every category, so an unused 'ALL' has no rows to draw
+            self.governorates = self.governorates.assign(
+                Governorate=self.governorates['Governorate'].cat.remove_unused_categories())
+        self.total = self.df[self.df['Governorate'] == TOTAL_LOCATION]
+
+    def display_metrics(self):
+        """Display the latest and peak totals from the store's running state."""
+        state = self.store.locations().get(TOTAL_LOCATION)
+        if state is None:
+            st.write("No IDP data available.")
+            return
+        col1, col2, col3 = st.columns(3)
+        col1.metric(f"IDPs at Shelters ({state['last_date']})", f"{int(state['latest']['IDPs at Shelters']):,}")
+        col2.metric("Number of Shelters", f"{int(state['latest']['Number of Shelters']):,}")
+        col3.metric(f"Peak IDPs at Shelters ({state['peak_date']['IDPs at Shelters']})",
+                    f"{int(state['peak']['IDPs at Shelters']):,}")
+
+    def plot_idps_by_governorate(self):
+        """Plot IDPs at shelters over time, stacked by governorate."""
+        st.subheader("IDPs at Shelters by Governorate")
+        plotly_chart('gaza_idp.by_governorate', self.fingerprint, self.idps_by_governorate_figure,
+                     use_container_width=True)
+
+    def idps_by_governorate_figure(self):
+        """Build the stacked area chart of IDPs per governorate."""
+        fig = px.area(self.governorates, x='Date', y='IDPs at Shelters', color='Governorate',
+                      title='IDPs at Shelters by Governorate')
+        fig.update_layout(hovermode="x unified", template="plotly_white")
+        return fig
+
+    def plot_shelter_types(self):
+        """Plot IDPs at UNRWA and government shelters over time."""
+        st.subheader("UNRWA and Government Shelters")
+        plotly_chart('gaza_idp.shelter_types', self.fingerprint, self.shelter_types_figure, use_container_width=True)
+
+    def shelter_types_figure(self):
+        """Build the UNRWA / government shelter line chart from the published totals."""
+        fig = px.line(self.total, x='Date', y=['IDPs at UNRWA Shelters', 'IDPs at Government Shelters'],
+                      title='IDPs by Shelter Type', labels={'value': 'IDPs', 'variable': 'Shelter Type'})
+        fig.update_layout(hovermode="x unified", template="plotly_white")
+        return fig
+
+    def plot_latest_by_governorate(self):
+        """Plot the latest and peak IDPs per governorate."""
+        st.subheader("Latest and Peak IDPs per Governorate")
+        plotly_chart('gaza_idp.latest_by_governorate', self.fingerprint, self.latest_by_governorate_figure,
+                     use_container_width=True)
+
+    def latest_by_governorate_figure(self):
+        """Build the latest vs peak bar chart from the store's running state."""
+        rows = [{'Governorate': name, 'Latest': state['latest'].get('IDPs at Shelters'),
+                 'Peak': state['peak'].get('IDPs at Shelters')}
+                for name, state in self.store.locations().items() if name != TOTAL_LOCATION]
+        fig = px.bar(pd.DataFrame(rows), x='Governorate', y=['Latest', 'Peak'], barmode='group',
+                     title='Latest and Peak IDPs at Shelters', labels={'value': 'IDPs', 'variable': ''})
+        fig.update_layout(template="plotly_white")
+        return fig
+
+    def plot_reported_vs_summed(self):
+        """Compare the published total with the sum over governorates."""
+        st.subheader("Published Total vs Sum of Governorates")
+        plotly_chart('gaza_idp.reported_vs_summed', self.fingerprint, self.reported_vs_summed_figure,
+                     use_container_width=True)
+
+    def reported_vs_summed_figure(self):
+        """Build the published vs summed totals line chart."""
+        summed = self.store.totals()['IDPs at Shelters'].rename('Sum of Governorates')
+        reported = self.total.set_index('Date')['IDPs at Shelters'].rename('Published Total')
+        both = pd.concat([reported, summed], axis=1).reset_index()
+        fig = px.line(both, x='Date', y=['Published Total', 'Sum of Governorates'],
+                      title='IDPs at Shelters: Published Total vs Sum of Governorates',
+                      labels={'value': 'IDPs', 'variable': ''})
+        fig.update_layout(hovermode="x unified", template="plotly_white")
+        return fig
+
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('gaza_idp.by_governorate', 'IDPs at Shelters by Governorate', 'idps_by_governorate_figure'),
+    ('gaza_idp.shelter_types', 'UNRWA and Government Shelters', 'shelter_types_figure'),
+    ('gaza_idp.latest_by_governorate', 'Latest and Peak IDPs per Governorate', 'latest_by_governorate_figure'),
+    ('gaza_idp.reported_vs_summed', 'Published Total vs Sum of Governorates', 'reported_vs_summed_figure'),
+]
+
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(GazaIDPDashboard(), builder)()
+
+
+def gimain():
+    st.header("Gaza Internally Displaced Persons (IDP) Analysis")
+    st.write("Internally displaced persons sheltering in UNRWA and government shelters in Gaza since 7 October 2023.")
+    dashboard = GazaIDPDashboard()
+    dashboard.display_metrics()
+    dashboard.plot_idps_by_governorate()
+    dashboard.plot_shelter_types()
+    dashboard.plot_latest_by_governorate()
+    dashboard.plot_reported_vs_summed()
+
+
+if __name__ == "__main__":
+    gimain()
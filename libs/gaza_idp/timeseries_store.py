@@ -0,0 +1,175 @@
+import datetime
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+sys.path.append('../')
+
+from libs.common.columnar_cache import CACHE_DIR
+
+KEY_COLUMNS = ['Date', 'Governorate']
+MEASURES = ['IDPs at Shelters', 'IDPs at UNRWA Shelters', 'IDPs at Government Shelters',
+            'Number of Shelters', 'UNRWA Shelters', 'Government Shelters']
+TOTAL_LOCATION = 'ALL'  # the workbook's "Total" sheet
+
+
+def _empty_state():
+    return {'segments': [], 'rows_read': {}, 'locations': {}, 'totals': {}}
+
+
+def read_new_rows(source, rows_read):
+    """Rows of every sheet past the first ``rows_read[sheet]`` data rows, as one frame.
+
+    The workbook is streamed in read-only mode and each sheet is entered at its
+    first unread row, so cells of rows already in the store are never converted.
+    A sheet's data ends at the first row whose first cell is not a date (the
+    source notes). Returns the frame and the updated row counts.
+    """
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        records = []
+        rows_read = dict(rows_read)
+        for sheet in workbook.worksheets:
+            done = rows_read.get(sheet.title, 0)
+            for row in sheet.iter_rows(min_row=done + 2, values_only=True):  # row 1 is the header
+                if not row or not isinstance(row[0], datetime.datetime):
+                    break
+                records.append(row[:len(KEY_COLUMNS) + len(MEASURES)])
+                done += 1
+            rows_read[sheet.title] = done
+    finally:
+        workbook.close()
+    df = pd.DataFrame.from_records(records, columns=KEY_COLUMNS + MEASURES)
+    df['Date'] = pd.to_datetime(df['Date']).dt.normalize()
+    df['Governorate'] = df['Governorate'].astype(str).str.strip()
+    df[MEASURES] = df[MEASURES].apply(pd.to_numeric, errors='coerce').astype('float64')
+    return df, rows_read
+
+
+class TimeSeriesStore:
+    """Append-only store of IDP counts keyed by (date, governorate).
+
+    Rows live in numbered Arrow segments under ``directory``; ``state.json``
+    records the segments, how many data rows of each sheet were read, and the
+    running state updated on every append: per governorate the last date,
+    latest and peak values, and per date the sum over governorates. A newer
+    workbook only has its unread rows parsed, and only rows later than a
+    governorate's last date are appended.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        state_path = self.directory / 'state.json'
+        self.state = json.loads(state_path.read_text()) if state_path.exists() else _empty_state()
+
+    def _write_state(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / 'state.json'
+        tmp = target.with_name(f'{target.name}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(self.state))
+        os.replace(tmp, target)
+
+    def reset(self):
+        """Forget every row (the source was revised rather than extended)."""
+        for segment in self.state['segments']:
+            try:
+                (self.directory / segment).unlink()
+            except FileNotFoundError:
+                pass
+        self.state = _empty_state()
+        self._write_state()
+
+    def _append(self, rows):
+        """Append rows newer than their governorate's last date; returns the rows kept."""
+        locations = self.state['locations']
+        last = rows['Governorate'].map(lambda name: locations.get(name, {}).get('last_date', ''))
+        rows = rows[rows['Date'].dt.strftime('%Y-%m-%d') > last]
+        rows = rows.drop_duplicates(KEY_COLUMNS, keep='last').sort_values(KEY_COLUMNS).reset_index(drop=True)
+        if rows.empty:
+            return rows
+
+        segment = f"segment-{len(self.state['segments']) + 1:05d}.arrow"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f'{segment}.{os.getpid()}.tmp'
+        feather.write_feather(pa.Table.from_pandas(rows, preserve_index=False), str(tmp), compression='uncompressed')
+        os.replace(tmp, self.directory / segment)
+        self.state['segments'].append(segment)
+
+        for name, group in rows.groupby('Governorate', sort=False):
+            entry = locations.setdefault(name, {'rows': 0, 'last_date': '', 'latest': {}, 'peak': {}, 'peak_date': {}})
+            entry['rows'] += len(group)
+            entry['last_date'] = group['Date'].max().strftime('%Y-%m-%d')
+            latest = group.iloc[-1]
+            for measure in MEASURES:
+                if not pd.isna(latest[measure]):
+                    entry['latest'][measure] = float(latest[measure])
+                values = group[measure].dropna()
+                if not values.empty and values.max() > entry['peak'].get(measure, float('-inf')):
+                    entry['peak'][measure] = float(values.max())
+                    entry['peak_date'][measure] = group.loc[values.idxmax(), 'Date'].strftime('%Y-%m-%d')
+
+        governorates = rows[rows['Governorate'] != TOTAL_LOCATION]
+        totals = self.state['totals']
+        for date, sums in governorates.groupby('Date')[MEASURES].sum(min_count=1).iterrows():
+            day = totals.setdefault(date.strftime('%Y-%m-%d'), [0.0] * len(MEASURES))
+            for i, value in enumerate(sums):
+                if not pd.isna(value):
+                    day[i] += float(value)
+        return rows
+
+    def sync(self, source):
+        """Bring the store up to date with ``source``; returns the number of rows appended."""
+        with self._lock:
+            rows, rows_read = read_new_rows(source, self.state['rows_read'])
+            if any(count < self.state['rows_read'].get(sheet, 0) for sheet, count in rows_read.items()):
+                self.reset()
+                rows, rows_read = read_new_rows(source, {})
+            appended = self._append(rows)
+            self.state['rows_read'] = rows_read
+            self._write_state()
+            return len(appended)
+
+    def frame(self):
+        """Every stored row, ordered by governorate and date."""
+        with self._lock:
+            segments = [self.directory / segment for segment in self.state['segments']]
+        if not segments:
+            return pd.DataFrame({column: pd.Series(dtype='float64') for column in KEY_COLUMNS + MEASURES})
+        table = pa.concat_tables(feather.read_table(str(path), memory_map=True) for path in segments)
+        return table.to_pandas().sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True)
+
+    def totals(self):
+        """Per-date sums over the governorates, maintained incrementally."""
+        with self._lock:
+            totals = dict(self.state['totals'])
+        df = pd.DataFrame.from_dict(totals, orient='index', columns=MEASURES)
+        df.index = pd.to_datetime(df.index)
+        return df.sort_index().rename_axis('Date')
+
+    def locations(self):
+        """Running state per governorate: rows, last date, latest and peak values."""
+        with self._lock:
+            return json.loads(json.dumps(self.state['locations']))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def store_for(source):
+    """The process-wide store of the time series read from ``source``."""
+    source = Path(source)
+    directory = CACHE_DIR / f'{source.stem.replace(" ", "_")}-timeseries'
+    with _stores_lock:
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = TimeSeriesStore(directory)
+        return store
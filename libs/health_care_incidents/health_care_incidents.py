@@ -1,13 +1,21 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
 
 import sys
 sys.path.append('../')
 
+from libs.common.catalog import load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.downsample import plot_downsampled
+from libs.common.figures import new_figure, rotate_xticks
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import pyplot
+
+@instrument_methods()
 class HealthCareIncidentsAnalysis:
     def __init__(self, data_loader):
         self.df = data_loader()
+        self.fingerprint = frame_fingerprint(self.df)
 
     def run_analysis(self):
         st.header("Health Care Incidents Analysis")
@@ -21,37 +29,66 @@ class HealthCareIncidentsAnalysis:
 
     def plot_time_series(self):
         st.subheader("Incidents Over Time")
-        df_time_series = self.df.groupby(self.df['Date'].dt.to_period('M')).size()
-        fig, ax = plt.subplots(figsize=(12, 6))
-        df_time_series.plot(kind='line', marker='o', ax=ax)
-        ax.set_title('Number of Incidents Over Time (Monthly)')
-        ax.set_ylabel('Number of Incidents')
-        ax.set_xlabel('Date (Monthly)')
-        plt.xticks(rotation=45)
-        plt.grid(True)
-        st.pyplot(fig)
+        pyplot('health.time_series', self.fingerprint, self.time_series_figure)
         
         st.write("The graph shows the trend of health care incidents over time. We can observe periods of increased activity, which may correlate with escalations in the conflict.")
 
+    def daily_incidents(self):
+        """Incidents per day, days without incidents included, with a 7-day average."""
+        dates = self.df['Date'].dropna().dt.normalize()
+        counts = dates.value_counts().sort_index()
+        if not counts.empty:
+            counts = counts.reindex(pd.date_range(counts.index.min(), counts.index.max(), freq='D'), fill_value=0)
+        daily = pd.DataFrame({'Date': counts.index, 'Incidents': counts.to_numpy()})
+        daily['7-day average'] = daily['Incidents'].rolling(7, min_periods=1).mean()
+        daily.attrs['source_hash'] = f'{self.fingerprint}-daily'
+        return daily
+
+    def time_series_figure(self):
+        daily = self.daily_incidents()
+        fig, ax = new_figure(figsize=(12, 6))
+        plot_downsampled(ax, daily, 'Date', 'Incidents', method='minmax', color='tab:blue', alpha=0.5,
+                         label='Incidents per day')
+        plot_downsampled(ax, daily, 'Date', '7-day average', color='tab:red', label='7-day average')
+        ax.set_title('Number of Incidents Over Time (Daily)')
+        ax.set_ylabel('Number of Incidents')
+        ax.set_xlabel('Date')
+        ax.legend()
+        rotate_xticks(ax, 45)
+        ax.grid(True)
+        return fig
+
     def plot_incidents_by_location(self):
         st.subheader("Top Locations by Number of Incidents")
+        pyplot('health.incidents_by_location', self.fingerprint, self.incidents_by_location_figure)
+        
+        st.write("This chart highlights the areas most affected by health care incidents. Understanding the geographical distribution can help in allocating resources and planning interventions.")
+
+    def incidents_by_location_figure(self):
         df_location = self.df['Admin 1'].value_counts().head(10)
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = new_figure(figsize=(12, 6))
         df_location.plot(kind='bar', ax=ax)
         ax.set_title('Top Locations by Number of Incidents')
         ax.set_ylabel('Number of Incidents')
         ax.set_xlabel('Location')
-        plt.xticks(rotation=45)
-        st.pyplot(fig)
-        
-        st.write("This chart highlights the areas most affected by health care incidents. Understanding the geographical distribution can help in allocating resources and planning interventions.")
+        rotate_xticks(ax, 45)
+        return fig
+
+    def health_worker_impact(self):
+        df_workers_impacted = self.df[['Health Workers Killed', 'Health Workers Injured', 'Health Workers Kidnapped']].apply(pd.to_numeric, errors='coerce')
+        return df_workers_impacted.sum()
 
     def analyze_impact_on_health_workers(self):
         st.subheader("Impact on Health Workers")
-        df_workers_impacted = self.df[['Health Workers Killed', 'Health Workers Injured', 'Health Workers Kidnapped']].apply(pd.to_numeric, errors='coerce')
-        impact_totals = df_workers_impacted.sum()
+        impact_totals = self.health_worker_impact()
+        pyplot('health.worker_impact', self.fingerprint, self.health_worker_impact_figure)
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+        st.write(f"The data shows a significant impact on health workers. {int(impact_totals['Health Workers Killed'])} health workers have been killed, which is a tragic loss for the healthcare system and the communities they serve.")
+        st.write(f"Additionally, {int(impact_totals['Health Workers Injured'])} have been injured and {int(impact_totals['Health Workers Kidnapped'])} kidnapped, further straining the healthcare capacity in the affected areas.")
+
+    def health_worker_impact_figure(self):
+        impact_totals = self.health_worker_impact()
+        fig, (ax1, ax2) = new_figure(1, 2, figsize=(15, 6))
         
         # Bar chart for total killed
         ax1.bar('Health Workers Killed', impact_totals['Health Workers Killed'], color='red')
@@ -62,25 +99,24 @@ class HealthCareIncidentsAnalysis:
         colors = ['#ff9999','#66b3ff','#99ff99']
         ax2.pie(impact_totals, labels=impact_totals.index, autopct='%1.1f%%', startangle=90, colors=colors, shadow=True)
         ax2.set_title('Distribution of Impact on Health Workers')
-        
-        st.pyplot(fig)
-        
-        st.write(f"The data shows a significant impact on health workers. {int(impact_totals['Health Workers Killed'])} health workers have been killed, which is a tragic loss for the healthcare system and the communities they serve.")
-        st.write(f"Additionally, {int(impact_totals['Health Workers Injured'])} have been injured and {int(impact_totals['Health Workers Kidnapped'])} kidnapped, further straining the healthcare capacity in the affected areas.")
+        return fig
 
     def plot_weapon_usage(self):
         st.subheader("Weapons Used in Incidents")
+        pyplot('health.weapon_usage', self.fingerprint, self.weapon_usage_figure)
+        
+        st.write("This chart shows the types of weapons most frequently used in incidents affecting healthcare. Understanding the nature of these attacks can inform protective measures and international advocacy efforts.")
+
+    def weapon_usage_figure(self):
         weapon_counts = self.df['Weapon Carried/Used'].value_counts()
         
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = new_figure(figsize=(12, 6))
         weapon_counts.plot(kind='bar', ax=ax)
         ax.set_title('Frequency of Weapons Used')
         ax.set_ylabel('Number of Incidents')
         ax.set_xlabel('Weapon Type')
-        plt.xticks(rotation=45, ha='right')
-        st.pyplot(fig)
-        
-        st.write("This chart shows the types of weapons most frequently used in incidents affecting healthcare. Understanding the nature of these attacks can inform protective measures and international advocacy efforts.")
+        rotate_xticks(ax, 45, ha='right')
+        return fig
 
     def conclude_analysis(self):
         st.subheader("Key Takeaways")
@@ -92,14 +128,25 @@ class HealthCareIncidentsAnalysis:
 
 # Usage
 def load_health_data():
-    # Replace this with your actual data loading logic
-    file_path = r'/home/marktine/data Vis/Isreal_x_Hamas-BI-/libs/misic/data-points/spreadsheets/xslx/2023-2024-israel-and-opt-attacks-on-health-care-incident-data.xlsx'
-    data = pd.read_excel(file_path)
-    data_cleaned = data.dropna(axis=1)
-    df = data_cleaned
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    return load('health_care_incidents')
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('health.time_series', 'Incidents Over Time', 'time_series_figure'),
+    ('health.incidents_by_location', 'Top Locations by Number of Incidents', 'incidents_by_location_figure'),
+    ('health.worker_impact', 'Impact on Health Workers', 'health_worker_impact_figure'),
+    ('health.weapon_usage', 'Weapons Used in Incidents', 'weapon_usage_figure'),
+]
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(HealthCareIncidentsAnalysis(load_health_data), builder)()
 
-    return df
+def hcmain():
+    HCanalysis = HealthCareIncidentsAnalysis(load_health_data)
+    HCanalysis.run_analysis()
 
-HCanalysis = HealthCareIncidentsAnalysis(load_health_data)
+if __name__ == "__main__":
+    hcmain()
 
@@ -0,0 +1,117 @@
+import streamlit as st
+import plotly.express as px
+import sys
+sys.path.append('../')
+
+from libs.common.catalog import load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.figures import new_figure, rotate_xticks
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import plotly_chart, pyplot
+from libs.common.spatial_index import index_for
+
+TILE_SIZES = [0.5, 1.0, 2.0, 5.0]
+
+
+def load_events():
+    """Return the UCDP GED events from the dataset catalog (HXL tags in ``attrs['hxl']``)."""
+    return load('iran_conflict')
+
+
+def derived_caches(df):
+    """Spatial index of a dataset version, built once and shared."""
+    return index_for('iran_conflict', df, measures=('best', 'deaths_civilians'))
+
+
+@instrument_methods()
+class IranConflictDashboard:
+    def __init__(self):
+        self.df = load_events()
+        self.fingerprint = frame_fingerprint(self.df)
+        self.index = derived_caches(self.df)
+
+    def tiles(self, years=None, tile_size=1.0):
+        """Pre-aggregated map tiles for the selected years."""
+        return self.index.tiles(tile_size, periods=years)
+
+    def display_metrics(self, tiles):
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Events", int(tiles['events'].sum()))
+        col2.metric("Deaths (best estimate)", int(tiles['best'].sum()))
+        col3.metric("Civilian Deaths", int(tiles['deaths_civilians'].sum()))
+
+    def plot_event_map(self, years, tile_size):
+        """Plot events aggregated to grid tiles."""
+        st.subheader("Conflict Events by Grid Tile")
+        plotly_chart('iran.event_map', self.fingerprint,
+                     lambda: self.event_map_figure(years, tile_size),
+                     params={'years': years, 'tile_size': tile_size}, use_container_width=True)
+
+    def event_map_figure(self, years=None, tile_size=1.0):
+        """Build the tile map; only one marker per non-empty tile is sent to the browser."""
+        tiles = self.tiles(years, tile_size)
+        fig = px.scatter_geo(tiles, lat='latitude', lon='longitude', size='events', color='best',
+                             hover_data={'events': True, 'best': True, 'deaths_civilians': True},
+                             color_continuous_scale='YlOrRd', size_max=30,
+                             title=f'Events and Deaths per {tile_size:g}° Tile')
+        fig.update_geos(fitbounds='locations', showcountries=True)
+        return fig
+
+    def plot_fatalities_by_year(self):
+        """Plot fatalities by year as a stacked bar chart."""
+        st.subheader("Fatalities by Year")
+        pyplot('iran.fatalities_by_year', self.fingerprint, self.fatalities_by_year_figure)
+
+    def fatalities_by_year_figure(self):
+        """Build the stacked fatalities by year bar chart."""
+        fatalities_per_year = self.df.groupby('year')[['deaths_a', 'deaths_b', 'deaths_civilians']].sum()
+        fig, ax = new_figure(figsize=(15, 6))
+        fatalities_per_year.plot(kind='bar', stacked=True, ax=ax)
+        ax.set_title('Fatalities by Year')
+        ax.set_xlabel('Year')
+        ax.set_ylabel('Number of Fatalities')
+        rotate_xticks(ax, 45)
+        return fig
+
+    def display_radius_query(self):
+        """List the events within a radius of a chosen point."""
+        st.subheader("Events near a Location")
+        col1, col2, col3 = st.columns(3)
+        lat = col1.number_input("Latitude", value=35.69, min_value=-90.0, max_value=90.0)
+        lon = col2.number_input("Longitude", value=51.39, min_value=-180.0, max_value=180.0)
+        km = col3.number_input("Radius (km)", value=100.0, min_value=1.0, max_value=2000.0)
+        nearby = self.df.iloc[self.index.radius(lat, lon, km)]
+        st.write(f"{len(nearby)} events within {km:g} km, {int(nearby['best'].sum())} deaths (best estimate)")
+        st.dataframe(nearby[['date_start', 'conflict_name', 'side_a', 'side_b', 'where_description', 'best']],
+                     use_container_width=True)
+
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('iran.event_map', 'Conflict Events by Grid Tile', 'event_map_figure'),
+    ('iran.fatalities_by_year', 'Fatalities by Year', 'fatalities_by_year_figure'),
+]
+
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(IranConflictDashboard(), builder)()
+
+
+def icmain():
+    st.title("Iran Conflict Events (UCDP GED)")
+    dashboard = IranConflictDashboard()
+
+    first, last = int(dashboard.df['year'].min()), int(dashboard.df['year'].max())
+    years = st.slider("Years", min_value=first, max_value=last, value=(first, last))
+    tile_size = st.selectbox("Tile size (degrees)", TILE_SIZES, index=1)
+
+    dashboard.display_metrics(dashboard.tiles(years, tile_size))
+    dashboard.plot_event_map(years, tile_size)
+    dashboard.plot_fatalities_by_year()
+    dashboard.display_radius_query()
+
+
+if __name__ == "__main__":
+    icmain()
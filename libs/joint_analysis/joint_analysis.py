@@ -0,0 +1,131 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import sys
+sys.path.append('../')
+
+from libs.common.alignment import (LEVELS, MIN_PERIODS, correlations, lag_correlations, level_rows,
+                                   measures_at, panel_for)
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import plotly_chart
+
+ALL_REGIONS = 'All regions'
+LEVEL_NAMES = {'admin1': 'Admin 1 (Gaza Strip / West Bank)', 'admin2': 'Admin 2 (governorates)'}
+
+
+@instrument_methods()
+class JointAnalysisDashboard:
+    def __init__(self):
+        self.panel = panel_for()  # Aligned month x region panel, persisted per dataset versions
+        self.fingerprint = frame_fingerprint(self.panel)
+        self.level = 'admin1'
+        self.region = None
+
+    def select(self, level, region=None):
+        """Restrict the views to one admin level and, optionally, one region."""
+        self.level = level
+        self.region = None if region in (None, ALL_REGIONS) else region
+
+    @property
+    def params(self):
+        return {'level': self.level, 'region': self.region}
+
+    def regions(self):
+        return list(level_rows(self.panel, self.level)['region'].unique())
+
+    def measures(self):
+        return measures_at(self.panel, self.level, self.region)
+
+    def display_coverage(self):
+        """Months with data per measure and the region labels left out of the panel."""
+        rows = level_rows(self.panel, self.level, self.region)
+        coverage = pd.DataFrame({
+            'months with data': rows.groupby('month')[self.measures()].count().gt(0).sum(),
+            'first month': [rows.loc[rows[m].notna(), 'month'].min() for m in self.measures()],
+            'last month': [rows.loc[rows[m].notna(), 'month'].max() for m in self.measures()],
+        })
+        st.dataframe(coverage, use_container_width=True)
+        unmatched = {dataset: labels for dataset, labels in self.panel.attrs.get('unmatched', {}).items() if labels}
+        if unmatched:
+            st.caption("Region labels outside the crosswalk (left out): "
+                       + "; ".join(f"{dataset}: {', '.join(labels)}" for dataset, labels in unmatched.items()))
+
+    def plot_correlations(self):
+        """Plot the correlation matrix of every measure at the selected level."""
+        st.subheader("Correlation Between Datasets")
+        plotly_chart('joint.correlations', self.fingerprint, self.correlations_figure, params=self.params,
+                     use_container_width=True)
+        st.write(f"Pearson correlation over region-months; blank where two measures share fewer than {MIN_PERIODS} months.")
+
+    def correlations_figure(self):
+        """Build the correlation heatmap."""
+        matrix = correlations(self.panel, self.level, self.region)
+        fig = px.imshow(matrix.round(2), zmin=-1, zmax=1, color_continuous_scale='RdBu_r', text_auto=True,
+                        title='Correlation Between Measures by Month and Region', aspect='auto')
+        fig.update_layout(height=700)
+        return fig
+
+    def plot_lags(self, leader, follower):
+        """Plot the correlation of ``leader`` with ``follower`` some months later."""
+        st.subheader("Lagged Correlation")
+        plotly_chart('joint.lags', self.fingerprint, lambda: self.lags_figure(leader, follower),
+                     params={**self.params, 'leader': leader, 'follower': follower}, use_container_width=True)
+        st.write(f"A peak at lag k > 0 means changes in {leader} tend to come k months before changes in {follower}.")
+
+    def lags_figure(self, leader, follower):
+        """Build the lag correlation bar chart."""
+        lags = lag_correlations(self.panel, leader, follower, self.level, self.region).reset_index()
+        fig = px.bar(lags, x='lag', y='correlation', range_y=[-1, 1],
+                     title=f'Correlation of {leader} (month t) with {follower} (month t + lag)',
+                     labels={'lag': 'Lag (months)', 'correlation': 'Correlation'})
+        fig.update_layout(template="plotly_white")
+        fig.update_xaxes(dtick=1)
+        return fig
+
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('joint.correlations', 'Correlation Between Datasets', 'correlations_figure'),
+    ('joint.lags', 'Lagged Correlation: Civilian Targeting and Political Violence', 'lags_figure'),
+]
+DEFAULT_LAG_PAIR = ('civilian_targeting_fatalities', 'political_violence_events')
+
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    dashboard = JointAnalysisDashboard()
+    if chart_id == 'joint.lags':
+        return dashboard.lags_figure(*DEFAULT_LAG_PAIR)
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(dashboard, builder)()
+
+
+def jamain():
+    st.header("Joint Analysis Across Datasets")
+    st.write("Health care incidents, civilian targeting, political violence, demolitions, Gaza IDPs, commodity prices "
+             "and escalation impact aligned on one monthly calendar and a shared set of regions.")
+    dashboard = JointAnalysisDashboard()
+
+    level = st.selectbox("Region level", LEVELS, format_func=LEVEL_NAMES.get)
+    dashboard.select(level)
+    region = st.selectbox("Region", [ALL_REGIONS] + dashboard.regions())
+    dashboard.select(level, region)
+
+    dashboard.display_coverage()
+    dashboard.plot_correlations()
+
+    measures = dashboard.measures()
+    if len(measures) < 2:
+        st.write("Fewer than two measures have data for this selection.")
+        return
+    col1, col2 = st.columns(2)
+    leader = col1.selectbox("Leading measure", measures,
+                            index=measures.index(DEFAULT_LAG_PAIR[0]) if DEFAULT_LAG_PAIR[0] in measures else 0)
+    follower = col2.selectbox("Following measure", measures,
+                              index=measures.index(DEFAULT_LAG_PAIR[1]) if DEFAULT_LAG_PAIR[1] in measures else 1)
+    dashboard.plot_lags(leader, follower)
+
+
+if __name__ == "__main__":
+    jamain()
@@ -0,0 +1,219 @@
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+sys.path.append('../')
+
+SOFT_HYPHEN = '\u00ad'
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+QUERY_PATTERN = re.compile(r'(-?)"([^"]*)"|(\S+)')
+FIELD_GAP = 1  # Positions skipped between headline and description so phrases never span both
+
+_ARRAYS = ('term_offsets', 'doc_ids', 'position_offsets', 'positions', 'rows', 'dates', 'date_offsets')
+
+
+def tokenize(text):
+    """Lower-cased word tokens of ``text`` after soft-hyphen removal and NFKC."""
+    text = unicodedata.normalize('NFKC', text.replace(SOFT_HYPHEN, ''))
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query):
+    """Parse a query into OR-groups of ``(negated, words)`` clauses.
+
+    Terms are ANDed by default, ``OR`` starts a new group, ``NOT term`` or
+    ``-term`` excludes, and ``"quoted words"`` is a phrase.
+    """
+    groups, clauses, negate_next = [], [], False
+    for match in QUERY_PATTERN.finditer(query):
+        sign, phrase, word = match.groups()
+        if word == 'OR':
+            groups.append(clauses)
+            clauses, negate_next = [], False
+            continue
+        if word in ('AND', 'NOT'):
+            negate_next = word == 'NOT'
+            continue
+        if word is not None:
+            sign, phrase = ('-', word[1:]) if word.startswith('-') else ('', word)
+        words = tokenize(phrase)
+        if words:
+            clauses.append((negate_next or sign == '-', words))
+        negate_next = False
+    groups.append(clauses)
+    return [group for group in groups if group]
+
+
+class InvertedIndex:
+    """Positional inverted index over the headlines corpus.
+
+    Documents are numbered in date order, so each day is a contiguous range of
+    doc ids (``date_offsets``) and a date filter is two binary searches. Posting
+    lists are stored as flat CSR arrays and persisted as ``.npy`` files that are
+    memory-mapped on load.
+    """
+
+    def __init__(self, terms, arrays):
+        self.terms = terms
+        self.term_ids = {term: i for i, term in enumerate(terms)}
+        self.term_offsets = arrays['term_offsets']  # term id -> slice of postings
+        self.doc_ids = arrays['doc_ids']  # posting -> doc id
+        self.position_offsets = arrays['position_offsets']  # posting -> slice of positions
+        self.positions = arrays['positions']
+        self.rows = arrays['rows']  # doc id -> row of the headlines frame
+        self.dates = arrays['dates']  # distinct days, ascending
+        self.date_offsets = arrays['date_offsets']  # day -> first doc id
+        self.num_docs = len(self.rows)
+
+    @classmethod
+    def build(cls, df, text_columns=('headline', 'description'), date_column='date'):
+        rows = np.argsort(df[date_column].to_numpy(dtype='datetime64[ns]'), kind='stable')  # NaT sorts last
+        days = df[date_column].to_numpy(dtype='datetime64[ns]')[rows].astype('datetime64[D]')
+        dated = days[~np.isnat(days)]
+        dates, first_docs = np.unique(dated, return_index=True)
+
+        vocabulary = {}
+        term_list, doc_list, position_list = [], [], []
+        columns = [df[col].to_numpy()[rows] for col in text_columns]
+        for doc, texts in enumerate(zip(*columns)):
+            offset = 0
+            for text in texts:
+                tokens = tokenize(text)
+                for pos, token in enumerate(tokens, offset):
+                    term_list.append(vocabulary.setdefault(token, len(vocabulary)))
+                    doc_list.append(doc)
+                    position_list.append(pos)
+                offset += len(tokens) + FIELD_GAP
+
+        term = np.asarray(term_list, dtype=np.int32)
+        doc = np.asarray(doc_list, dtype=np.int32)
+        position = np.asarray(position_list, dtype=np.int32)
+        order = np.lexsort((position, doc, term))
+        term, doc, position = term[order], doc[order], position[order]
+        starts = np.flatnonzero(np.r_[True, (term[1:] != term[:-1]) | (doc[1:] != doc[:-1])])
+
+        arrays = {
+            'term_offsets': np.searchsorted(term[starts], np.arange(len(vocabulary) + 1)).astype(np.int64),
+            'doc_ids': doc[starts],
+            'position_offsets': np.r_[starts, len(position)].astype(np.int64),
+            'positions': position,
+            'rows': rows.astype(np.int64),
+            'dates': dates,
+            'date_offsets': np.r_[first_docs, len(dated)].astype(np.int64),
+        }
+        return cls(sorted(vocabulary, key=vocabulary.get), arrays)
+
+    def save(self, directory):
+        """Write the index to ``directory`` atomically."""
+        directory = Path(directory)
+        tmp = directory.with_name(f"{directory.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        (tmp / 'terms.json').write_text(json.dumps(self.terms), encoding='utf-8')
+        for name in _ARRAYS:
+            np.save(tmp / f'{name}.npy', getattr(self, name))
+        try:
+            os.replace(tmp, directory)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # Another process saved it first
+            if not directory.exists():
+                raise
+
+    @classmethod
+    def load(cls, directory):
+        directory = Path(directory)
+        terms = json.loads((directory / 'terms.json').read_text(encoding='utf-8'))
+        arrays = {name: np.load(directory / f'{name}.npy', mmap_mode='r') for name in _ARRAYS}
+        return cls(terms, arrays)
+
+    def doc_range(self, start=None, end=None):
+        """Doc id bounds ``[lo, hi)`` of the days between ``start`` and ``end`` inclusive."""
+        if start is None and end is None:
+            return 0, self.num_docs
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, 'D'), 'left')
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(end, 'D'), 'right')
+        return int(self.date_offsets[lo]), int(self.date_offsets[max(hi, lo)])
+
+    def _postings(self, term):
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return 0, 0
+        return int(self.term_offsets[term_id]), int(self.term_offsets[term_id + 1])
+
+    def match(self, words):
+        """Sorted doc ids containing ``words`` as a term (one word) or an exact phrase."""
+        if len(words) == 1:
+            first, last = self._postings(words[0])
+            return np.asarray(self.doc_ids[first:last])
+        keys = None
+        for i, word in enumerate(words):
+            first, last = self._postings(word)
+            if first == last:
+                return np.empty(0, dtype=np.int32)
+            counts = np.diff(self.position_offsets[first:last + 1])
+            docs = np.repeat(np.asarray(self.doc_ids[first:last], dtype=np.int64), counts)
+            positions = np.asarray(self.positions[self.position_offsets[first]:self.position_offsets[last]]) - i
+            word_keys = (docs[positions >= 0] << 32) | positions[positions >= 0]
+            keys = word_keys if keys is None else np.intersect1d(keys, word_keys, assume_unique=True)
+        return np.unique(keys >> 32).astype(np.int32)
+
+    def search(self, query, start=None, end=None):
+        """Doc ids matching a boolean/phrase ``query`` within the date range, in date order."""
+        lo, hi = self.doc_range(start, end)
+        result = np.empty(0, dtype=np.int32)
+        for group in parse_query(query):
+            docs = None
+            for negated, words in sorted(group, key=lambda clause: clause[0]):
+                matched = self.match(words)
+                matched = matched[np.searchsorted(matched, lo):np.searchsorted(matched, hi)]
+                if negated:
+                    docs = np.arange(lo, hi, dtype=np.int32) if docs is None else docs
+                    docs = np.setdiff1d(docs, matched, assume_unique=True)
+                else:
+                    docs = matched if docs is None else np.intersect1d(docs, matched, assume_unique=True)
+            result = np.union1d(result, docs)
+        return result
+
+    def term_frequency(self, queries, start=None, end=None):
+        """Number of matching documents per day for each query, as a date-indexed frame."""
+        lo, hi = self.doc_range(start, end)
+        first_day = np.searchsorted(self.date_offsets, lo, 'right') - 1
+        last_day = np.searchsorted(self.date_offsets, hi, 'left')
+        days = self.dates[first_day:last_day]
+        counts = {}
+        for query in queries:
+            docs = self.search(query, start, end)
+            docs = docs[docs < self.date_offsets[-1]]  # Undated documents have no day
+            day = np.searchsorted(self.date_offsets, docs, 'right') - 1
+            counts[query] = np.bincount(day - first_day, minlength=len(days))
+        return pd.DataFrame(counts, index=pd.DatetimeIndex(days.astype('datetime64[ns]'), name='date'))
+
+
+_indexes = OrderedDict()
+_indexes_lock = threading.Lock()
+_MAX_INDEXES = 4
+
+
+def index_for(directory, load_frame):
+    """Return the index persisted in ``directory``, building it from ``load_frame()`` if missing."""
+    key = str(directory)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            if not Path(directory).exists():
+                InvertedIndex.build(load_frame()).save(directory)
+            index = InvertedIndex.load(directory)
+            _indexes[key] = index
+            while len(_indexes) > _MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
@@ -0,0 +1,189 @@
+import os
+import sys
+import time
+
+import pandas as pd
+import plotly.express as px
+import pyarrow as pa
+import streamlit as st
+sys.path.append('../')
+
+from libs.common.catalog import dataset_path, load
+from libs.common.columnar_cache import cache_path, file_hash
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import plotly_chart
+from libs.news_headlines.inverted_index import SOFT_HYPHEN, index_for
+
+CHUNK_ROWS = 50_000
+TEXT_COLUMNS = ['headline', 'description']
+SCHEMA = pa.schema([
+    ('headline', pa.string()),
+    ('description', pa.string()),
+    ('date', pa.date32()),
+])
+
+
+def normalize_text(values):
+    """Drop U+00AD soft hyphens and apply NFKC so substring search sees plain words."""
+    return values.str.replace(SOFT_HYPHEN, '', regex=False).str.normalize('NFKC')
+
+
+def iter_batches(source, chunksize=CHUNK_ROWS):
+    """Read the headlines CSV in chunks and yield normalized Arrow record batches.
+
+    Only one chunk is held in memory at a time, so feeds much larger than the
+    current file are ingested in constant memory.
+    """
+    reader = pd.read_csv(source, chunksize=chunksize, dtype=str, keep_default_na=False, encoding='utf-8')
+    for chunk in reader:
+        for col in TEXT_COLUMNS:
+            chunk[col] = normalize_text(chunk[col])
+        chunk['date'] = pd.to_datetime(chunk['date'], format='%d-%m-%Y', errors='coerce')
+        yield pa.RecordBatch.from_pandas(chunk[SCHEMA.names], schema=SCHEMA, preserve_index=False)
+
+
+def stream_path(source, digest=None):
+    """Location of the Arrow IPC stream built from one version of the CSV."""
+    return cache_path(source, 'headlines', digest).with_suffix('.arrows')
+
+
+def ingest_headlines(source, chunksize=CHUNK_ROWS):
+    """Write the normalized headlines as an Arrow IPC stream unless this CSV version is cached."""
+    target = stream_path(source, file_hash(source))
+    if target.exists():
+        return target
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), 'wb') as sink:
+        with pa.ipc.new_stream(sink, SCHEMA) as writer:
+            for batch in iter_batches(source, chunksize):
+                writer.write_batch(batch)
+    os.replace(tmp, target)
+    return target
+
+
+def read_headlines_table(source):
+    """Return the normalized headlines as an Arrow table read from the memory-mapped stream."""
+    target = ingest_headlines(source)
+    with pa.memory_map(str(target)) as stream:
+        return pa.ipc.open_stream(stream).read_all()
+
+
+def read_headlines(source):
+    """Catalog reader for the headlines CSV."""
+    df = read_headlines_table(source).to_pandas(date_as_object=False)
+    df.attrs['source_hash'] = file_hash(source)
+    return df
+
+
+def load_headlines():
+    """Return the headlines from the dataset catalog."""
+    return load('news_headlines')
+
+
+def load_headline_index(df=None):
+    """Return the inverted index of a headlines version (default: the served one), persisted on disk."""
+    df = load_headlines() if df is None else df
+    directory = cache_path(dataset_path('news_headlines'), 'index', df.attrs['source_hash']).with_suffix('')
+    return index_for(directory, lambda: df)
+
+
+def derived_caches(df):
+    """Inverted index of a headlines version, built (or memory-mapped) once and shared."""
+    return load_headline_index(df)
+
+
+@instrument_methods()
+class NewsHeadlinesDashboard:
+    def __init__(self):
+        self.df = load_headlines()
+        self.fingerprint = frame_fingerprint(self.df)
+        self.index = load_headline_index(self.df)
+
+    def display_metrics(self):
+        """Display headline counts and the covered date range."""
+        dates = self.df['date'].dropna()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Headlines", len(self.df))
+        col2.metric("Days Covered", dates.nunique())
+        col3.metric("Date Range", f"{dates.min():%d %b %Y} - {dates.max():%d %b %Y}")
+
+    def plot_headlines_per_day(self):
+        """Plot the number of headlines published per day."""
+        st.subheader("Headlines per Day")
+        plotly_chart('news.headlines_per_day', self.fingerprint,
+                     self.headlines_per_day_figure, use_container_width=True)
+
+    def headlines_per_day_figure(self):
+        """Build the headlines per day line chart."""
+        per_day = self.df.groupby('date').size().rename('Headlines').reset_index()
+        return px.line(per_day, x='date', y='Headlines', title='Headlines per Day')
+
+    def search(self, query, start=None, end=None):
+        """Return the headlines matching a boolean/phrase query, newest first."""
+        docs = self.index.search(query, start, end)
+        return self.df.iloc[self.index.rows[docs[::-1]]]
+
+    def select_date_range(self):
+        """Date range picker limited to the dates covered by the corpus."""
+        first, last = self.df['date'].min().date(), self.df['date'].max().date()
+        selected = st.date_input("Date range", value=(first, last), min_value=first, max_value=last)
+        if isinstance(selected, (tuple, list)) and len(selected) == 2:
+            return selected
+        return first, last
+
+    def display_search(self, start, end):
+        """Search box over headlines and descriptions."""
+        st.subheader("Search Headlines")
+        query = st.text_input("Search headlines and descriptions",
+                              help='Words are ANDed; use OR, NOT or -word, and "quotes" for phrases.')
+        if query:
+            started = time.perf_counter()
+            matches = self.search(query, start, end)
+            elapsed = (time.perf_counter() - started) * 1000
+            st.write(f"{len(matches)} matching headlines ({elapsed:.1f} ms)")
+            st.dataframe(matches[['date', 'headline', 'description']], use_container_width=True)
+
+    def plot_term_frequency(self, start, end):
+        """Plot weekly headline counts for a few terms or phrases."""
+        st.subheader("Term Frequency over Time")
+        terms = st.text_input("Terms to compare (comma separated)", value='ceasefire, hostages, "aid trucks"')
+        queries = [term.strip() for term in terms.split(',') if term.strip()]
+        if queries:
+            plotly_chart('news.term_frequency', self.fingerprint,
+                         lambda: self.term_frequency_figure(queries, start, end),
+                         params={'terms': queries, 'start': start, 'end': end}, use_container_width=True)
+
+    def term_frequency_figure(self, queries=('ceasefire', 'hostages', '"aid trucks"'), start=None, end=None):
+        """Build the weekly term frequency line chart."""
+        weekly = self.index.term_frequency(queries, start, end).resample('W').sum()
+        weekly = weekly.reset_index().melt(id_vars='date', var_name='Term', value_name='Headlines')
+        return px.line(weekly, x='date', y='Headlines', color='Term', title='Weekly Headlines Mentioning Each Term')
+
+
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('news.headlines_per_day', 'Headlines per Day', 'headlines_per_day_figure'),
+    ('news.term_frequency', 'Term Frequency over Time', 'term_frequency_figure'),
+]
+
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(NewsHeadlinesDashboard(), builder)()
+
+
+def nhmain():
+    st.title("Israel-Hamas News Headlines")
+    dashboard = NewsHeadlinesDashboard()
+    dashboard.display_metrics()
+    dashboard.plot_headlines_per_day()
+    start, end = dashboard.select_date_range()
+    dashboard.display_search(start, end)
+    dashboard.plot_term_frequency(start, end)
+
+
+if __name__ == "__main__":
+    nhmain()
@@ -1,22 +1,31 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
 
+from libs.common.catalog import load
+from libs.common.dataset_store import frame_fingerprint
+from libs.common.aggregate_cube import cube_for
+from libs.common.figures import new_figure, rotate_xticks
+from libs.common.instrument import instrument_methods
+from libs.common.render_cache import pyplot
+
 class DataLoader:
     @staticmethod
-    @st.cache_data
-    def load_data(file_path):
-        """Load data from an Excel file and process it."""
-        df = pd.read_excel(file_path, sheet_name='Data')
-        df['month_of_year'] = df['Month'].str[:3] + '-' + df['Year'].astype(str).str[-2:]
-        df['Fatalities'] = df['Fatalities'].astype(int)
-        return df
+    def load_data(dataset='political_violence'):
+        """Return the processed data from the dataset catalog."""
+        return load(dataset)
+
 
+def derived_caches(df):
+    """Aggregate cube of a dataset version, built once and shared."""
+    return cube_for('political_violence', df)
 
+
+@instrument_methods()
 class Dashboard:
     def __init__(self, df):
         self.df = df
+        self.fingerprint = frame_fingerprint(df)
+        self.cube = derived_caches(df)  # Built once per dataset version
 
     def display_title(self):
         st.title('Israel-Hamas Conflict Dashboard')
@@ -27,15 +36,19 @@ class Dashboard:
 
     def display_yearly_metrics(self):
         """Calculate and display yearly metrics and their visualizations."""
-        yearly_metrics = self.df.groupby('Year').agg(
-            total_events=('Events', 'sum'),
-            total_fatalities=('Fatalities', 'sum'),
-            avg_events=('Events', 'mean'),
-            avg_fatalities=('Fatalities', 'mean')
-        ).reset_index()
-
         st.header('Events and Fatalities by Year')
-        fig, ax = plt.subplots(1, 2, figsize=(15, 6))
+        pyplot('political_violence.yearly_metrics', self.fingerprint, self.yearly_metrics_figure)
+
+        st.write("""
+        The graphs show a significant spike in both events and fatalities in 2023 and 2024, 
+        indicating an escalation in the conflict during these years.
+        """)
+
+    def yearly_metrics_figure(self):
+        """Build the events and fatalities by year bar charts."""
+        yearly_metrics = self.cube.yearly_metrics()
+
+        fig, ax = new_figure(1, 2, figsize=(15, 6))
 
         ax[0].bar(yearly_metrics['Year'], yearly_metrics['total_events'], color='skyblue')
         ax[0].set_title('Total Events by Year')
@@ -47,87 +60,93 @@ class Dashboard:
         ax[1].set_xlabel('Year')
         ax[1].set_ylabel('Total Fatalities')
 
-        plt.tight_layout()
-        st.pyplot(fig)
-
-        st.write("""
-        The graphs show a significant spike in both events and fatalities in 2023 and 2024, 
-        indicating an escalation in the conflict during these years.
-        """)
+        fig.tight_layout()
+        return fig
 
     def display_monthly_trend(self):
         """Display the trend of total events by month-year."""
         st.header('Trend of Total Events by Month-Year')
-        events_by_month_year = self.df.groupby('month_of_year')['Events'].sum().reset_index()
-        events_by_month_year.sort_values(by='month_of_year', inplace=True)
+        pyplot('political_violence.monthly_trend', self.fingerprint, self.monthly_trend_figure)
+
+        st.write("""
+        The trend line shows periodic spikes in events, with a massive increase in late 2023 and early 2024.
+        """)
+
+    def monthly_trend_figure(self):
+        """Build the month-year events trend line."""
+        events_by_month_year = self.cube.month_of_year_totals('Events')
 
-        fig, ax = plt.subplots(figsize=(20, 6))
+        fig, ax = new_figure(figsize=(20, 6))
         ax.plot(events_by_month_year['month_of_year'], events_by_month_year['Events'], marker='o', linestyle='-', color='b')
         ax.set_xticklabels(events_by_month_year['month_of_year'], rotation=90)
         ax.set_xlabel('Month-Year')
         ax.set_ylabel('Total Events')
         ax.set_title('Trend of Total Events by Month-Year')
         ax.grid(True)
+        return fig
 
-        st.pyplot(fig)
+    def display_fatalities_by_region(self):
+        """Display total fatalities by region."""
+        st.header('Fatalities by Region')
+        pyplot('political_violence.fatalities_by_region', self.fingerprint, self.fatalities_by_region_figure)
 
         st.write("""
-        The trend line shows periodic spikes in events, with a massive increase in late 2023 and early 2024.
+        The chart reveals that Gaza has suffered the highest number of fatalities, 
+        followed by North Gaza and Khan Yunis.
         """)
 
-    def display_fatalities_by_region(self):
-        """Display total fatalities by region."""
-        st.header('Fatalities by Region')
-        fatalities_by_region = self.df.groupby('Admin2')['Fatalities'].sum().reset_index()
+    def fatalities_by_region_figure(self):
+        """Build the fatalities by Admin2 bar chart."""
+        fatalities_by_region = self.cube.rollup(['Admin2'])['Fatalities'].reset_index()
 
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = new_figure(figsize=(12, 6))
         ax.bar(fatalities_by_region['Admin2'], fatalities_by_region['Fatalities'], color='teal')
         ax.set_xlabel('Region (Admin2)')
         ax.set_ylabel('Total Fatalities')
         ax.set_title('Total Fatalities by Region (Admin2)')
-        plt.xticks(rotation=45, ha='right')
+        rotate_xticks(ax, 45, ha='right')
+        return fig
 
-        st.pyplot(fig)
+    def display_correlation_heatmap(self):
+        """Display the correlation heatmap between events and fatalities."""
+        st.header('Correlation between Events and Fatalities')
+        pyplot('political_violence.correlation', self.fingerprint, self.correlation_heatmap_figure)
 
         st.write("""
-        The chart reveals that Gaza has suffered the highest number of fatalities, 
-        followed by North Gaza and Khan Yunis.
+        The heatmap shows a strong positive correlation (0.84) between the number of events and fatalities, 
+        indicating that as the number of violent events increases, so does the number of fatalities.
         """)
 
-    def display_correlation_heatmap(self):
-        """Display the correlation heatmap between events and fatalities."""
-        st.header('Correlation between Events and Fatalities')
+    def correlation_heatmap_figure(self):
+        """Build the events/fatalities correlation heatmap."""
         correlation_data = self.df[['Events', 'Fatalities']]
         correlation_matrix = correlation_data.corr()
 
-        fig, ax = plt.subplots(figsize=(8, 6))
+        fig, ax = new_figure(figsize=(8, 6))
         sns.heatmap(correlation_matrix, annot=True, cmap="coolwarm", vmin=-1, vmax=1, ax=ax)
         ax.set_title('Correlation Heatmap: Events and Fatalities')
+        return fig
 
-        st.pyplot(fig)
+    def display_fatalities_heatmap_by_region_year(self):
+        """Display fatalities heatmap by region and year."""
+        st.header('Fatalities Heatmap by Region and Year')
+        pyplot('political_violence.fatalities_heatmap', self.fingerprint, self.fatalities_heatmap_figure)
 
         st.write("""
-        The heatmap shows a strong positive correlation (0.84) between the number of events and fatalities, 
-        indicating that as the number of violent events increases, so does the number of fatalities.
+        The heatmap illustrates the concentration of fatalities across different regions over the years. 
+        It clearly shows the intense escalation of the conflict in Gaza and surrounding areas in 2023 and 2024.
         """)
 
-    def display_fatalities_heatmap_by_region_year(self):
-        """Display fatalities heatmap by region and year."""
-        st.header('Fatalities Heatmap by Region and Year')
-        fatalities_pivot = self.df.pivot_table(values='Fatalities', index='Admin2', columns='Year', aggfunc='sum', fill_value=0)
+    def fatalities_heatmap_figure(self):
+        """Build the Admin2 x Year fatalities heatmap."""
+        fatalities_pivot = self.cube.pivot('Fatalities', index='Admin2', columns='Year')
 
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = new_figure(figsize=(12, 8))
         sns.heatmap(fatalities_pivot, annot=True, cmap="Reds", linewidths=0.5, linecolor='white', ax=ax)
         ax.set_title('Total Fatalities Heatmap by Region (Admin2) and Year')
         ax.set_xlabel('Year')
         ax.set_ylabel('Region (Admin2)')
-
-        st.pyplot(fig)
-
-        st.write("""
-        The heatmap illustrates the concentration of fatalities across different regions over the years. 
-        It clearly shows the intense escalation of the conflict in Gaza and surrounding areas in 2023 and 2024.
-        """)
+        return fig
 
     def display_conclusion(self):
         """Display the conclusion of the dashboard analysis."""
@@ -146,10 +165,25 @@ class Dashboard:
         """)
 
 
+# Charts included in the headless report: (chart id, title, figure builder)
+REPORT_CHARTS = [
+    ('political_violence.yearly_metrics', 'Events and Fatalities by Year', 'yearly_metrics_figure'),
+    ('political_violence.monthly_trend', 'Trend of Total Events by Month-Year', 'monthly_trend_figure'),
+    ('political_violence.fatalities_by_region', 'Fatalities by Region', 'fatalities_by_region_figure'),
+    ('political_violence.correlation', 'Correlation between Events and Fatalities', 'correlation_heatmap_figure'),
+    ('political_violence.fatalities_heatmap', 'Fatalities Heatmap by Region and Year', 'fatalities_heatmap_figure'),
+]
+
+
+def report_figure(chart_id):
+    """Build one report chart without Streamlit."""
+    builder = {chart: method for chart, _, method in REPORT_CHARTS}[chart_id]
+    return getattr(Dashboard(DataLoader.load_data()), builder)()
+
+
 def pvmain():
     # Load data
-    file_path = '/home/marktine/data Vis/Isreal_x_Hamas-BI-/libs/misic/data-points/spreadsheets/xslx/palestine_hrp_political_violence_events_and_fatalities_by_month-year_as-of-29may2024.xlsx'
-    df = DataLoader.load_data(file_path)
+    df = DataLoader.load_data()
 
     # Initialize Dashboard
     dashboard = Dashboard(df)
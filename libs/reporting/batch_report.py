@@ -0,0 +1,133 @@
+import argparse
+import base64
+import datetime
+import html
+import importlib
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import plotly.offline
+
+sys.path.append('../')
+
+from libs.common.columnar_cache import REPO_ROOT, ingest
+from libs.common.figures import release
+from libs.common.render_cache import figure_to_png
+
+# Report sections in page order: (section title, page module)
+SECTIONS = [
+    ('Health Care Incidents', 'libs.health_care_incidents.health_care_incidents'),
+    ('Commodity Market', 'libs.commodity_market.commodity_market'),
+    ('Political Violence', 'libs.pol_violence.pol_violance'),
+    ('Palestine Civilian Targeting Events', 'libs.civilian_fatalities.civfatalities'),
+    ('Escalation of Hostilities Impact', 'libs.civilian_fatalities.civilianfatalities'),
+    ('Gaza Internally Displaced Persons', 'libs.gaza_idp.gaza_idp'),
+    ('Displacement due to Demolitions in the West Bank', 'libs.displacement.displacement'),
+    ('News Headlines', 'libs.news_headlines.news_headlines'),
+    ('Iran Conflict Events', 'libs.iran_conflict.iran_conflict'),
+    ('Joint Analysis Across Datasets', 'libs.joint_analysis.joint_analysis'),
+]
+
+
+def render_chart(module_name, chart_id):
+    """Worker: build one chart headless and return it as PNG bytes or a Plotly HTML fragment."""
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+        fig = module.report_figure(chart_id)
+        if hasattr(fig, 'to_html'):
+            kind, payload = 'plotly', fig.to_html(full_html=False, include_plotlyjs=False)
+        else:
+            try:
+                kind, payload = 'png', figure_to_png(fig)
+            finally:
+                release(fig)
+    except Exception:
+        kind, payload = 'error', traceback.format_exc()
+    return chart_id, kind, payload, time.perf_counter() - start
+
+
+def _chart_html(title, kind, payload):
+    if kind == 'png':
+        data = base64.b64encode(payload).decode()
+        body = f'<img src="data:image/png;base64,{data}" alt="{html.escape(title)}">'
+    elif kind == 'plotly':
+        body = payload
+    else:
+        body = f'<pre class="error">{html.escape(payload)}</pre>'
+    return f'<section class="chart"><h3>{html.escape(title)}</h3>{body}</section>'
+
+
+def build_report(output_dir, workers=None, plotlyjs='inline'):
+    """Render every page's charts in a process pool and write one self-contained HTML file."""
+    started = time.perf_counter()
+    ingest()  # Parse the workbooks once here rather than in every worker
+
+    jobs = []
+    for _, module_name in SECTIONS:
+        module = importlib.import_module(module_name)
+        for chart_id, title, _ in module.REPORT_CHARTS:
+            jobs.append((module_name, chart_id, title))
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(render_chart, module_name, chart_id) for module_name, chart_id, _ in jobs]
+        results = {}
+        for future in futures:
+            result = future.result()
+            results[result[0]] = result
+
+    if plotlyjs == 'inline':
+        script = f'<script type="text/javascript">{plotly.offline.get_plotlyjs()}</script>'
+    else:
+        script = '<script src="https://cdn.plot.ly/plotly-latest.min.js"></script>'
+
+    generated = datetime.datetime.now()
+    parts = [
+        '<!DOCTYPE html><html><head><meta charset="utf-8">',
+        '<title>Israel-Hamas Conflict Analysis Report</title>',
+        '<style>body{font-family:sans-serif;margin:2em}img{max-width:100%}'
+        '.error{color:#a00;white-space:pre-wrap}</style>',
+        script, '</head><body>',
+        '<h1>Israel-Hamas Conflict Analysis Report</h1>',
+        f'<p>Generated {generated:%Y-%m-%d %H:%M}</p>',
+    ]
+    failures = 0
+    for section_title, module_name in SECTIONS:
+        parts.append(f'<h2>{html.escape(section_title)}</h2>')
+        for job_module, chart_id, title in jobs:
+            if job_module != module_name:
+                continue
+            _, kind, payload, _ = results[chart_id]
+            failures += kind == 'error'
+            parts.append(_chart_html(title, kind, payload))
+    parts.append('</body></html>')
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_path = output_dir / f'dashboard-report-{generated:%Y-%m-%d}.html'
+    report_path.write_text('\n'.join(parts), encoding='utf-8')
+
+    for chart_id, kind, _, seconds in results.values():
+        print(f'{chart_id:<45} {kind:<7} {seconds:6.2f}s')
+    print(f'Wrote {report_path} in {time.perf_counter() - started:.1f}s '
+          f'({len(results)} charts, {failures} failed)')
+    return report_path, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render every dashboard page to a static HTML report.')
+    parser.add_argument('--output', default=str(REPO_ROOT / 'reports'), help='directory for the report')
+    parser.add_argument('--workers', type=int, default=None, help='process pool size (default: CPU count)')
+    parser.add_argument('--plotlyjs', choices=('inline', 'cdn'), default='inline',
+                        help='embed plotly.js in the report or load it from the CDN')
+    args = parser.parse_args()
+    _, failures = build_report(args.output, args.workers, args.plotlyjs)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import importlib
+import sys
+from contextlib import contextmanager
+
+sys.path.append('../')
+
+from libs.common.alignment import DATASETS
+from libs.common.benchmark import run_suite, scale_frame, time_call, time_chart
+from libs.common.catalog import build_derived, load, publish, read_dataset, store_key
+from libs.common.dataset_store import STORE
+from libs.common.render_cache import RENDER_CACHE
+
+# Pages in sidebar order: (name, page module, entry point, datasets it loads, scalable)
+# The headline index is persisted per dataset version, so headlines only run on the shipped data.
+PAGES = [
+    ('health_care', 'libs.health_care_incidents.health_care_incidents', 'hcmain', ['health_care_incidents'], True),
+    ('commodity', 'libs.commodity_market.commodity_market', 'cmmain', ['commodity_prices'], True),
+    ('political_violence', 'libs.pol_violence.pol_violance', 'pvmain', ['political_violence'], True),
+    ('civilian_targeting', 'libs.civilian_fatalities.civfatalities', 'cfmain', ['civilian_targeting'], True),
+    ('escalation_impact', 'libs.civilian_fatalities.civilianfatalities', 'main', ['escalation_impact'], True),
+    ('gaza_idp', 'libs.gaza_idp.gaza_idp', 'gimain', ['gaza_idps'], False),
+    ('displacement', 'libs.displacement.displacement', 'main', ['displacement_since_2009', 'displacement_by_year'], True),
+    ('news_headlines', 'libs.news_headlines.news_headlines', 'nhmain', ['news_headlines'], False),
+    ('iran_conflict', 'libs.iran_conflict.iran_conflict', 'icmain', ['iran_conflict'], True),
+    ('joint_analysis', 'libs.joint_analysis.joint_analysis', 'jamain', DATASETS, True),
+]
+DEFAULT_SCALES = [10, 100]
+
+
+class _Streamlit:
+    """Stand-in for the ``streamlit`` module: layout calls do nothing, widgets return their defaults."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def sidebar(self):
+        return self
+
+    def columns(self, spec, **kwargs):
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+    def slider(self, label, min_value=None, max_value=None, value=None, *args, **kwargs):
+        return min_value if value is None else value
+
+    def selectbox(self, label, options, index=0, *args, **kwargs):
+        return list(options)[index]
+
+    radio = selectbox
+
+    def multiselect(self, label, options, default=None, *args, **kwargs):
+        return list(default or [])
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, *args, **kwargs):
+        return min_value if value is None else value
+
+    def text_input(self, label, value='', *args, **kwargs):
+        return value
+
+    def date_input(self, label, value=None, *args, **kwargs):
+        return value
+
+    def checkbox(self, label, value=False, *args, **kwargs):
+        return value
+
+
+@contextmanager
+def stub_streamlit():
+    """Swap ``st`` for ``_Streamlit`` in every loaded ``libs`` module."""
+    real = sys.modules['streamlit']
+    patched = [module for name, module in list(sys.modules.items())
+               if name.startswith('libs.') and getattr(module, 'st', None) is real]
+    for module in patched:
+        module.st = _Streamlit()
+    try:
+        yield
+    finally:
+        for module in patched:
+            module.st = real
+
+
+@contextmanager
+def serving(frames):
+    """Serve ``{name: frame}`` through ``load`` in place of the files, as a hot swap would."""
+    keys = {name: store_key(name, df.attrs['source_hash']) for name, df in frames.items()}
+    for name, df in frames.items():
+        STORE.get(keys[name], lambda df=df: df)
+    publish({name: key[2] for name, key in keys.items()})
+    try:
+        yield
+    finally:
+        publish({name: None for name in frames})
+        for key in keys.values():
+            STORE.invalidate(key)
+
+
+def benchmark_page(module, entry, datasets, repeat=1):
+    """Time one page on whatever ``load`` currently serves.
+
+    Phases: ``derived`` (the derived caches of each dataset, built cold),
+    ``transform:<chart>`` (a report chart's data preparation: everything its
+    builder does outside plotting-library calls), ``render:<chart>`` (those
+    calls plus serialising the figure), ``transform`` (``derived`` plus every
+    chart's preparation) and ``page`` (the entry point end to end with an
+    empty render cache and a stubbed ``st``). Chart timings are best of ``repeat``.
+    """
+    phases = {}
+    frames = {name: load(name) for name in datasets}
+    phases['derived'] = sum(time_call(lambda: build_derived(name, df))[0] for name, df in frames.items())
+    phases['transform'] = phases['derived']
+    for chart_id, _, _ in module.REPORT_CHARTS:
+        prepare, render = time_chart(lambda: module.report_figure(chart_id), repeat)
+        phases[f'transform:{chart_id}'] = prepare
+        phases[f'render:{chart_id}'] = render
+        phases['transform'] += prepare
+
+    def run_page():
+        RENDER_CACHE.clear()
+        with stub_streamlit():
+            getattr(module, entry)()
+    phases['page'] = time_call(run_page, repeat)[0]
+    return phases
+
+
+def run(args):
+    results = {}
+    for page, module_name, entry, datasets, scalable in PAGES:
+        if args.pages and page not in args.pages:
+            continue
+        module = importlib.import_module(module_name)
+        shipped = {}
+        load_seconds = 0.0
+        for name in datasets:
+            seconds, shipped[name] = time_call(lambda: read_dataset(name), args.repeat)
+            load_seconds += seconds
+        with serving(shipped):
+            results[f'{page}[shipped]'] = {'load': load_seconds, **benchmark_page(module, entry, datasets, args.repeat)}
+        for factor in args.scales if scalable else ():
+            with serving({name: scale_frame(df, factor) for name, df in shipped.items()}):
+                results[f'{page}[x{factor}]'] = benchmark_page(module, entry, datasets, args.repeat)
+    return results
+
+
+def add_arguments(parser):
+    parser.add_argument('--pages', nargs='*', help="page names to run (default: all)")
+    parser.add_argument('--scales', nargs='*', type=int, default=DEFAULT_SCALES,
+                        help="synthetic dataset sizes as multiples of the shipped data (default: %(default)s)")
+
+
+if __name__ == '__main__':
+    sys.exit(run_suite("Time data load, transformation and chart rendering of every dashboard page.", run,
+                       add_arguments=add_arguments))
@@ -0,0 +1,16 @@
+import pytest
+
+from libs.admin import admin
+
+
+def test_the_page_is_off_without_a_token(monkeypatch):
+    monkeypatch.setattr(admin, 'ADMIN_TOKEN', '')
+    assert not admin.authorized('')
+    assert not admin.authorized('1')
+
+
+@pytest.mark.parametrize('token, opens', [('s3cret', True), (['s3cret'], True), ('', False), ('1', False),
+                                           ([], False), ('s3cret ', False)])
+def test_only_the_configured_token_opens_the_page(monkeypatch, token, opens):
+    monkeypatch.setattr(admin, 'ADMIN_TOKEN', 's3cret')
+    assert admin.authorized(token) is opens
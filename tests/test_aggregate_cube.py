@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from libs.common.aggregate_cube import AggregateCube
+
+
+def test_rows_with_missing_dimension_values_are_skipped():
+    df = pd.DataFrame({
+        'Year': [2023, 2023, None, 2024],
+        'Month': ['January', 'January', 'February', None],
+        'Admin1': ['Gaza Strip', 'West Bank', 'Gaza Strip', 'West Bank'],
+        'Admin2': ['Rafah', np.nan, 'Rafah', 'Jenin'],
+        'Events': [1, 2, 4, 8],
+        'Fatalities': [10, 20, 40, 80],
+    })
+    cube = AggregateCube(df)
+
+    # Same rows as a groupby over every dimension, which drops missing keys
+    expected = (df.groupby(['Year', 'Month', 'Admin1', 'Admin2'])[['Events', 'Fatalities']].sum()
+                .groupby(level=['Year', 'Admin1']).sum())
+    rollup = cube.rollup(['Year', 'Admin1'])
+    assert rollup[['Events', 'Fatalities']].to_dict() == expected.to_dict()
+    assert rollup['rows'].sum() == 1
+
+
+def test_frame_without_complete_rows_gives_an_empty_cube():
+    df = pd.DataFrame({'Year': [None], 'Month': ['May'], 'Admin1': ['Gaza Strip'], 'Admin2': ['Rafah'],
+                       'Events': [1], 'Fatalities': [1]})
+    cube = AggregateCube(df)
+    assert cube.counts.sum() == 0
+    assert cube.rollup(['Admin1']).empty
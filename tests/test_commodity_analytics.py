@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from libs.commodity_market.analytics import PRICE_AFTER, PRICE_BEFORE, CommodityPrices, month_columns
+from libs.commodity_market.benchmark import synthetic_commodity_data
+
+
+def _workbook():
+    # Month columns out of order and Dec-23 missing, as a release may ship them
+    return pd.DataFrame({
+        'Commodity Name': ['rice', 'flour', 'sugar', 'salt'],
+        'Amount': ['1 kg', '1 kg', '1 kg', '1 kg'],
+        PRICE_BEFORE: [10.0, np.nan, 0.0, np.nan],
+        PRICE_AFTER: [20.0, 4.0, 3.0, np.nan],
+        'Jan-24': [20.0, 5.0, np.nan, np.nan],
+        'Nov-23': [25.0, np.nan, 6.0, np.nan],
+    })
+
+
+# The per-column loops the page used before the price matrix
+
+def _loop_monthly_changes(df):
+    columns = [column for _, column in month_columns(df.columns)]
+    changes = pd.DataFrame(index=df.index)
+    for old, new in zip(columns[:-1], columns[1:]):
+        changes[f'{old} to {new}'] = (df[new] - df[old]) / df[old] * 100
+    return changes.replace([np.inf, -np.inf], np.nan).to_numpy()
+
+
+def _loop_cumulative_change(df):
+    columns = [column for _, column in month_columns(df.columns)]
+    changes = []
+    for _, row in df[columns].iterrows():
+        reported = row.dropna()
+        if reported.empty or reported.iloc[0] == 0:
+            changes.append(np.nan)
+        else:
+            changes.append((reported.iloc[-1] - reported.iloc[0]) / reported.iloc[0] * 100)
+    return np.array(changes)
+
+
+def _loop_volatility(df):
+    columns = [column for _, column in month_columns(df.columns) if column != PRICE_BEFORE]
+    return df[columns].std(axis=1).to_numpy()
+
+
+def test_months_are_ordered_and_labelled():
+    prices = CommodityPrices(_workbook())
+    assert prices.months == ['Sep-23', 'Oct-23', 'Nov-23', 'Jan-24']
+    assert prices.periods == ['Sep-23 to Oct-23', 'Oct-23 to Nov-23', 'Nov-23 to Jan-24']
+
+
+def test_monthly_changes():
+    expected = np.array([
+        [100.0, 25.0, -20.0],
+        [np.nan, np.nan, np.nan],   # the months either side of each period are missing
+        [np.nan, 100.0, np.nan],    # no change from a zero price
+        [np.nan, np.nan, np.nan],
+    ])
+    np.testing.assert_allclose(CommodityPrices(_workbook()).monthly_changes(), expected)
+
+
+def test_cumulative_change_skips_missing_prices():
+    expected = np.array([100.0, 25.0, np.nan, np.nan])
+    np.testing.assert_allclose(CommodityPrices(_workbook()).cumulative_change(), expected)
+
+
+def test_volatility_since_october():
+    expected = np.array([np.sqrt(25 / 3), np.sqrt(0.5), np.sqrt(4.5), np.nan])
+    np.testing.assert_allclose(CommodityPrices(_workbook()).volatility(), expected)
+
+
+def test_missing_values_rank_last():
+    summary = CommodityPrices(_workbook()).summary()
+    assert summary.set_index('Commodity Name')['Cumulative Rank'].to_dict() == {
+        'rice': 1, 'flour': 2, 'salt': 3, 'sugar': 4}
+    assert list(summary['Volatility Rank']) == [1, 3, 2, 4]
+
+
+@pytest.mark.parametrize('df', [_workbook(), synthetic_commodity_data(50, 24)], ids=['workbook', 'synthetic'])
+def test_matches_the_loop_implementation(df):
+    df = df.copy()
+    rng = np.random.default_rng(1)
+    price_columns = df.columns[2:]
+    df[price_columns] = df[price_columns].mask(rng.random((len(df), len(price_columns))) < 0.1)
+    prices = CommodityPrices(df)
+    np.testing.assert_allclose(prices.monthly_changes(), _loop_monthly_changes(df))
+    np.testing.assert_allclose(prices.cumulative_change(), _loop_cumulative_change(df))
+    np.testing.assert_allclose(prices.volatility(), _loop_volatility(df))
@@ -0,0 +1,62 @@
+"""Benchmarks of the commodity page: load, transform and render on the workbook and on synthetic data.
+
+Run with pytest-benchmark (requirements-dev.txt); save a baseline with
+``--benchmark-autosave`` and fail on regressions with
+``--benchmark-compare --benchmark-compare-fail=mean:25%``.
+"""
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from libs.common.benchmark import render
+from libs.common.catalog import read_dataset
+from libs.commodity_market.analytics import PRICE_AFTER, PRICE_BEFORE
+from libs.commodity_market.benchmark import synthetic_commodity_data, transform
+from libs.commodity_market.commodity_market import REPORT_CHARTS, CommodityDashboard
+
+# COMMODITIESxMONTHS; rendering draws one bar per commodity, so it runs on the smaller size only
+TRANSFORM_SIZES = ['1000x60', '5000x500']
+RENDER_SIZES = ['1000x60']
+
+
+@pytest.fixture(scope='module')
+def workbook():
+    return read_dataset('commodity_prices')
+
+
+def _frame(case, workbook):
+    if case == 'workbook':
+        return workbook
+    return synthetic_commodity_data(*(int(value) for value in case.split('x')))
+
+
+def test_load_workbook(benchmark):
+    df = benchmark.pedantic(read_dataset, args=('commodity_prices',), rounds=3)
+    assert {'Commodity Name', 'Amount', PRICE_BEFORE, PRICE_AFTER} <= set(df.columns)
+    assert len(df) > 0
+
+
+@pytest.mark.parametrize('case', ['workbook'] + TRANSFORM_SIZES)
+def test_transform(benchmark, workbook, case):
+    df = _frame(case, workbook)
+    prices = benchmark(transform, df)
+
+    n_commodities, n_months = prices.prices.shape
+    assert n_commodities == len(df)
+    assert prices.monthly_changes().shape == (n_commodities, n_months - 1)
+    summary = prices.summary()
+    assert sorted(summary['Cumulative Rank']) == list(range(1, n_commodities + 1))
+    assert sorted(summary['Volatility Rank']) == list(range(1, n_commodities + 1))
+    if case != 'workbook':
+        # Synthetic prices have no gaps: the cumulative change runs from the first to the last column
+        first, last = df[PRICE_BEFORE].to_numpy(), df.iloc[:, -1].to_numpy()
+        np.testing.assert_allclose(prices.cumulative_change(), (last - first) / first * 100)
+
+
+@pytest.mark.parametrize('chart_id, method', [(chart_id, method) for chart_id, _, method in REPORT_CHARTS])
+@pytest.mark.parametrize('case', ['workbook'] + RENDER_SIZES)
+def test_render(benchmark, workbook, case, chart_id, method):
+    dashboard = CommodityDashboard(_frame(case, workbook))
+    payload = benchmark.pedantic(render, args=(getattr(dashboard, method),), rounds=1)
+    assert payload.startswith(b'\x89PNG')
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from libs.common.dataset_store import DatasetStore
+
+
+def _loader():
+    return pd.DataFrame({
+        'count': np.arange(4, dtype='int64'),
+        'value': np.linspace(0, 1, 4),
+        'date': pd.date_range('2024-01-01', periods=4),
+        'region': pd.Categorical(['Rafah', 'Jenin', 'Rafah', 'Gaza']),
+        'label': ['a', 'b', 'c', 'd'],
+    })
+
+
+def _write_or_raise(write):
+    try:
+        write()
+    except ValueError:
+        pass
+
+
+@pytest.mark.parametrize('write', [
+    lambda view: view.__setitem__('count', np.full(4, 99, dtype='int64')),
+    lambda view: view.__setitem__('value', np.full(4, -1.0)),
+    lambda view: view.__setitem__('label', ['x'] * 4),
+    lambda view: view.loc.__setitem__((0, 'count'), 99),
+    lambda view: view.iloc.__setitem__((1, 2), pd.Timestamp('2000-01-01')),
+    lambda view: view.loc.__setitem__((2, 'region'), 'Jenin'),
+    lambda view: view['count'].to_numpy().__setitem__(0, 99),
+])
+def test_writes_through_a_view_never_reach_the_stored_frame(write):
+    store = DatasetStore()
+    view = store.get('frame', _loader)
+    _write_or_raise(lambda: write(view))
+    pd.testing.assert_frame_equal(store.get('frame', _loader), _loader())
+
+
+def test_views_keep_dtypes_and_attrs():
+    def loader():
+        df = _loader()
+        df.attrs['source_hash'] = 'abc'
+        return df
+
+    view = DatasetStore().get('frame', loader)
+    assert view.attrs['source_hash'] == 'abc'
+    assert list(view.dtypes) == list(_loader().dtypes)
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+import libs.common.watcher as watcher_module
+from libs.common.watcher import DatasetWatcher
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    """Two watched files; hashing ``broken`` fails until ``fixed`` is set."""
+    broken, good = tmp_path / 'broken.xlsx', tmp_path / 'good.xlsx'
+    broken.write_bytes(b'1')
+    good.write_bytes(b'2')
+    fixed = []
+    swapped = []
+
+    def file_hash(path):
+        if path == str(broken) and not fixed:
+            raise OSError('file is being written')
+        return f'digest-of-{path}'
+
+    def swap(self, names, digest):
+        swapped.extend(names)
+        return True
+
+    monkeypatch.setattr(watcher_module, 'file_hash', file_hash)
+    monkeypatch.setattr(watcher_module, 'published', lambda name: None)
+    monkeypatch.setattr(DatasetWatcher, '_swap', swap)
+    monkeypatch.setattr(DatasetWatcher, 'publish_current', lambda self: None)
+    watcher = DatasetWatcher(names=[], interval=0.01)
+    watcher.files.update({str(broken): ['broken'], str(good): ['good']})
+    return watcher, broken, fixed, swapped
+
+
+def test_a_failing_file_does_not_stop_the_others(files):
+    watcher, _, _, swapped = files
+    assert watcher.check() == []  # first sighting: wait for the files to settle
+    assert watcher.check() == ['good']
+    assert swapped == ['good']
+    assert 'file is being written' in watcher.errors['broken']
+
+
+def test_the_thread_keeps_polling_after_a_failure(files):
+    watcher, broken, fixed, swapped = files
+    watcher.start()
+    try:
+        _wait_for(lambda: 'broken' in watcher.errors)
+        fixed.append(True)
+        broken.write_bytes(b'10')  # the next change is picked up
+        _wait_for(lambda: 'broken' in swapped)
+        assert watcher._thread.is_alive()
+    finally:
+        watcher.stop()
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)